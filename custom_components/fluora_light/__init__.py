@@ -2,20 +2,37 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN, LOGGER, PLATFORMS
 from .coordinator import LightCoordinator
+from .resolver import DATA_RESOLVER
+from .services import async_setup_services
+from .transport import DATA_TRANSPORT
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Fluora Light integration."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Fluora Light from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = LightCoordinator(hass, entry.entry_id, entry.data)
+    coordinator = LightCoordinator(hass, entry.entry_id, {**entry.data, **entry.options})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    await coordinator.async_config_entry_first_refresh()
+    # Entities restore their last state and stay unavailable until the light is reached,
+    # so startup is not gated on one network round-trip per light.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_create_background_task(
+        hass, coordinator.async_connect_in_background(), f"{DOMAIN} connect {coordinator.hostname}"
+    )
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     LOGGER.debug("Config entry setup complete for %s", entry.entry_id)
@@ -31,6 +48,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id, None)
         if coordinator is not None:
             await coordinator.async_close()
+        transport = hass.data[DOMAIN].get(DATA_TRANSPORT)
+        if transport is not None and transport.refcount == 0:
+            # Last entry unloaded; the shared socket is already closed.
+            hass.data[DOMAIN].pop(DATA_TRANSPORT)
+            hass.data[DOMAIN].pop(DATA_RESOLVER, None)
     return unload_ok
 
 
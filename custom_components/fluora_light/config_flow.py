@@ -2,11 +2,43 @@
 
 from __future__ import annotations
 
+import ipaddress
+from typing import Any
+
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.components import network
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CONF_ADAPTIVE_PACING,
+    CONF_HOSTNAME,
+    CONF_HOSTS,
+    CONF_NAME,
+    CONF_PACKET_GAP,
+    CONF_PORT,
+    CONF_REDUNDANT_SENDS,
+    CONF_STARTUP_SEND,
+    CONF_SUBNET,
+    CONF_TRANSITION_FPS,
+    CONF_USE_BUNDLES,
+    DEFAULT_ADAPTIVE_PACING,
+    DEFAULT_NAME,
+    DEFAULT_PACKET_GAP,
+    DEFAULT_PORT,
+    DEFAULT_REDUNDANT_SENDS,
+    DEFAULT_STARTUP_SEND,
+    DEFAULT_TRANSITION_FPS,
+    DEFAULT_USE_BUNDLES,
+    DOMAIN,
+    LOGGER,
+)
+from .discovery import async_scan, subnet_hosts
 
-from .const import CONF_HOSTNAME, CONF_NAME, CONF_PORT, DEFAULT_PORT, DOMAIN
+# Offered when the local address cannot be determined.
+FALLBACK_SUBNET = "192.168.1.0/24"
 
 
 class FluoraFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -14,8 +46,22 @@ class FluoraFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._discovered: list[str] = []
+        self._port = DEFAULT_PORT
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> FluoraOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return FluoraOptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "discover"])
+
+    async def async_step_manual(self, user_input=None):
+        """Add one light by hostname."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -31,5 +77,131 @@ class FluoraFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
 
-        return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+        return self.async_show_form(step_id="manual", data_schema=schema, errors=errors)
+
+    async def async_step_discover(self, user_input=None):
+        """Probe a subnet for lights answering on the Fluora port."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                hosts = subnet_hosts(user_input[CONF_SUBNET])
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                self._port = user_input[CONF_PORT]
+                configured = self._async_current_ids()
+                self._discovered = [
+                    host for host in await async_scan(hosts, self._port) if host not in configured
+                ]
+                if self._discovered:
+                    return await self.async_step_pick()
+                errors["base"] = "no_devices_found"
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_SUBNET, default=await self._async_default_subnet()): str,
+                vol.Optional(CONF_PORT, default=DEFAULT_PORT): vol.Coerce(int),
+            }
+        )
+
+        return self.async_show_form(step_id="discover", data_schema=schema, errors=errors)
+
+    async def async_step_pick(self, user_input=None):
+        """Create one entry per selected light."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if selected := user_input[CONF_HOSTS]:
+                # A flow creates a single entry, so the others start discovery flows.
+                for host in selected[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                            data=self._entry_data(host),
+                        )
+                    )
+                data = self._entry_data(selected[0])
+                await self.async_set_unique_id(data[CONF_HOSTNAME], raise_on_progress=False)
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(title=data[CONF_NAME], data=data)
+            errors["base"] = "no_devices_selected"
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_HOSTS, default=self._discovered): cv.multi_select(
+                    {host: host for host in self._discovered}
+                ),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={"count": str(len(self._discovered))},
+        )
+
+    async def async_step_integration_discovery(self, discovery_info: dict[str, Any]):
+        """Create an entry for a light picked from a discovery scan."""
+        await self.async_set_unique_id(discovery_info[CONF_HOSTNAME])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=discovery_info[CONF_NAME], data=discovery_info)
+
+    def _entry_data(self, host: str) -> dict[str, Any]:
+        return {CONF_NAME: f"{DEFAULT_NAME} {host}", CONF_HOSTNAME: host, CONF_PORT: self._port}
+
+    async def _async_default_subnet(self) -> str:
+        """The /24 around the address Home Assistant uses on the LAN."""
+        try:
+            source_ip = await network.async_get_source_ip(self.hass)
+        except Exception:  # noqa: BLE001
+            LOGGER.debug("Could not determine the local address for discovery", exc_info=True)
+            return FALLBACK_SUBNET
+        return str(ipaddress.IPv4Network(f"{source_ip}/24", strict=False))
+
+
+class FluoraOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Fluora Light options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        # OptionsFlow only provides config_entry itself from HA 2024.11 on.
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the send tuning options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_PACKET_GAP,
+                    default=options.get(CONF_PACKET_GAP, DEFAULT_PACKET_GAP),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=500)),
+                vol.Optional(
+                    CONF_ADAPTIVE_PACING,
+                    default=options.get(CONF_ADAPTIVE_PACING, DEFAULT_ADAPTIVE_PACING),
+                ): bool,
+                vol.Optional(
+                    CONF_TRANSITION_FPS,
+                    default=options.get(CONF_TRANSITION_FPS, DEFAULT_TRANSITION_FPS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                vol.Optional(
+                    CONF_USE_BUNDLES,
+                    default=options.get(CONF_USE_BUNDLES, DEFAULT_USE_BUNDLES),
+                ): bool,
+                vol.Optional(
+                    CONF_REDUNDANT_SENDS,
+                    default=options.get(CONF_REDUNDANT_SENDS, DEFAULT_REDUNDANT_SENDS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+                vol.Optional(
+                    CONF_STARTUP_SEND,
+                    default=options.get(CONF_STARTUP_SEND, DEFAULT_STARTUP_SEND),
+                ): bool,
+            }
+        )
 
+        return self.async_show_form(step_id="init", data_schema=schema)
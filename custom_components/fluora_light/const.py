@@ -11,17 +11,30 @@ DOMAIN = "fluora_light"
 CONF_NAME = "name"
 CONF_HOSTNAME = "hostname"
 CONF_PORT = "port"
+CONF_SUBNET = "subnet"
+CONF_HOSTS = "hosts"
+CONF_PACKET_GAP = "packet_gap"
+CONF_ADAPTIVE_PACING = "adaptive_pacing"
+CONF_USE_BUNDLES = "use_bundles"
+CONF_TRANSITION_FPS = "transition_fps"
+CONF_STARTUP_SEND = "startup_send"
+CONF_REDUNDANT_SENDS = "redundant_sends"
 
 DEFAULT_NAME = "Fluora Light"
 DEFAULT_PORT = 6767
-
-PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.NUMBER]
-
-BRIGHTNESS_HEX_FIRST = "2f557637614d46773550326c580000002c666900"
-BRIGHTNESS_HEX_LAST = "0000000000"
-
-POWER_ON_HEX = "2f5379594f5469586a51426a570000002c6969000000000100000000"
-POWER_OFF_HEX = "2f5379594f5469586a51426a570000002c6969000000000000000000"
+# Minimum gap between packets to one device, in milliseconds.
+DEFAULT_PACKET_GAP = 50
+DEFAULT_ADAPTIVE_PACING = True
+# Not every firmware accepts OSC bundles, so paced individual packets stay the default.
+DEFAULT_USE_BUNDLES = False
+# Frames per second streamed during client-side transitions.
+DEFAULT_TRANSITION_FPS = 20
+# Lights keep their look across HA restarts, so nothing is sent on connect by default.
+DEFAULT_STARTUP_SEND = False
+# Extra copies of each final-state packet; 0 keeps plain fire-and-forget sends.
+DEFAULT_REDUNDANT_SENDS = 0
+
+PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.NUMBER, Platform.SENSOR]
 
 EFFECT_AUTO = "Auto"
 EFFECT_RED = "Red"
@@ -46,34 +59,21 @@ COLOR_EFFECTS = [
     EFFECT_ORANGE,
     EFFECT_PURPLE,
 ]
+# Ordered by the scene index carried by SCENE_ROUTE.
 SCENE_EFFECTS = [EFFECT_PARTY, EFFECT_CHILL, EFFECT_FOCUS, EFFECT_BEDTIME, EFFECT_AWAKEN]
 
 EFFECT_LIST = COLOR_EFFECTS + SCENE_EFFECTS + [EFFECT_AUTO, EFFECT_WHITE, EFFECT_CUSTOM]
 
-AUTO_HEX = "2f697761614d6b567a4f66554d0000002c6969000000000000000000"
-SCENE_HEX = "2f697761614d6b567a4f66554d0000002c6969000000000100000000"
-MANUAL_HEX = "2f697761614d6b567a4f66554d0000002c6969000000000200000000"
-
-PARTY_HEX = "2f457055775a41314753506a4f0000002c6969000000000000000000"
-CHILL_HEX = "2f457055775a41314753506a4f0000002c6969000000000100000000"
-FOCUS_HEX = "2f457055775a41314753506a4f0000002c6969000000000200000000"
-BEDTIME_HEX = "2f457055775a41314753506a4f0000002c6969000000000300000000"
-AWAKEN_HEX = "2f457055775a41314753506a4f0000002c6969000000000400000000"
-
-RED_HEX = "2f5468576e787336356c30736a0000002c6669003f578e0000000000"
-ORANGE_HEX = "2f5468576e787336356c30736a0000002c6669003f5a4f0000000000"
-GREEN_HEX = "2f5468576e787336356c30736a0000002c6669003e69a30000000000"
-BLUE_HEX = "2f5468576e787336356c30736a0000002c6669003eef800000000000"
-PURPLE_HEX = "2f5468576e787336356c30736a0000002c6669003f37340000000000"
-YELLOW_HEX = "2f5468576e787336356c30736a0000002c666900360b670000000000"
-
-# Saturation payloads contain a 3-byte big-endian-like value encoded as 6 hex chars.
-MIN_SATURATION_HEX = (
-    "2f7936383755345a67796d736a0000002c666900" + f"{3932160:06x}" + "0000000000"
-)
-MAX_SATURATION_HEX = (
-    "2f7936383755345a67796d736a0000002c666900" + f"{4160442:06x}" + "0000000000"
-)
+# Values carried by MODE_ROUTE.
+DEVICE_MODE_AUTO = 0
+DEVICE_MODE_SCENE = 1
+DEVICE_MODE_MANUAL = 2
+
+# Routes captured from the vendor app's traffic; payloads are encoded in routes.py.
+BRIGHTNESS_ROUTE = "/Uv7aMFw5P2lX"
+POWER_ROUTE = "/SyYOTiXjQBjW"
+MODE_ROUTE = "/iwaaMkVzOfUM"
+SCENE_ROUTE = "/EpUwZA1GSPjO"
 
 # Palette control routes (from device config dump)
 HUE_ROUTE = "/ThWnxs65l0sj"
@@ -91,17 +91,41 @@ SATURATION_MAX = 0.983306884765625
 MANUAL_SPEED_ROUTE = "/Vd72e0D61BuM"
 MANUAL_SIZE_ROUTE = "/Vd7XP0X61BuM"
 
-SCENE_HEX_DICT = {
-    EFFECT_PARTY: PARTY_HEX,
-    EFFECT_CHILL: CHILL_HEX,
-    EFFECT_FOCUS: FOCUS_HEX,
-    EFFECT_BEDTIME: BEDTIME_HEX,
-    EFFECT_AWAKEN: AWAKEN_HEX,
-    EFFECT_AUTO: AUTO_HEX,
-    EFFECT_RED: RED_HEX,
-    EFFECT_ORANGE: ORANGE_HEX,
-    EFFECT_GREEN: GREEN_HEX,
-    EFFECT_BLUE: BLUE_HEX,
-    EFFECT_PURPLE: PURPLE_HEX,
-    EFFECT_YELLOW: YELLOW_HEX,
-}
+
+def scale_number(value: float, old_min: float, old_max: float, new_min: float, new_max: float) -> float:
+    return ((value - old_min) / (old_max - old_min)) * (new_max - new_min) + new_min
+
+
+def calculate_brightness_hex(desired_brightness: int) -> float:
+    # Device brightness curve approximation.
+    return scale_number((desired_brightness**0.1) - 1, 0, (100**0.1) - 1, 3932160, 4160442)
+
+
+def hue_to_device(hue_deg: float) -> float:
+    # The device hue wheel is offset vs HA's 0°=red.
+    return (float(hue_deg) / 360.0 + HUE_OFFSET) % 1.0
+
+
+def saturation_to_device(sat_pct: float) -> float:
+    sat_pct = max(0.0, min(100.0, float(sat_pct)))
+    return SATURATION_MIN + (sat_pct / 100.0) * (SATURATION_MAX - SATURATION_MIN)
+
+
+def hue_from_device(hue: float) -> float:
+    return round(((float(hue) - HUE_OFFSET) % 1.0) * 360.0, 2)
+
+
+def saturation_from_device(sat: float) -> float:
+    sat_pct = (float(sat) - SATURATION_MIN) / (SATURATION_MAX - SATURATION_MIN) * 100.0
+    return round(max(0.0, min(100.0, sat_pct)), 2)
+
+
+def hs_to_device(hue_deg: float, sat_pct: float) -> tuple[float, float]:
+    """Convert HA (hue 0-360, saturation 0-100) to the device's 0..1 float space."""
+    return hue_to_device(hue_deg), saturation_to_device(sat_pct)
+
+
+def hs_from_device(hue: float, sat: float) -> tuple[float, float]:
+    """Convert the device's 0..1 hue/saturation floats back to HA (hue 0-360, saturation 0-100)."""
+    return hue_from_device(hue), saturation_from_device(sat)
+
@@ -1,62 +1,218 @@
 from __future__ import annotations
 
 import asyncio
-import socket
-import struct
-from enum import StrEnum
+from collections.abc import Hashable
+from functools import partial
+import time
 from typing import Any
 
-from homeassistant.components.light import ATTR_BRIGHTNESS, ATTR_EFFECT, ATTR_HS_COLOR
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
-    AUTO_HEX,
-    BRIGHTNESS_HEX_FIRST,
-    BRIGHTNESS_HEX_LAST,
+    BRIGHTNESS_ROUTE,
     COLOR_EFFECTS,
+    DEVICE_MODE_AUTO,
+    DEVICE_MODE_MANUAL,
+    DEVICE_MODE_SCENE,
+    CONF_ADAPTIVE_PACING,
+    CONF_PACKET_GAP,
+    CONF_REDUNDANT_SENDS,
+    CONF_STARTUP_SEND,
+    CONF_TRANSITION_FPS,
+    CONF_USE_BUNDLES,
+    DEFAULT_ADAPTIVE_PACING,
+    DEFAULT_PACKET_GAP,
+    DEFAULT_REDUNDANT_SENDS,
+    DEFAULT_STARTUP_SEND,
+    DEFAULT_TRANSITION_FPS,
+    DEFAULT_USE_BUNDLES,
     EFFECT_AUTO,
     EFFECT_CUSTOM,
     EFFECT_WHITE,
-    HUE_OFFSET,
-    HUE_ROUTE,
     LOGGER,
-    MANUAL_HEX,
     MANUAL_SIZE_ROUTE,
     MANUAL_SPEED_ROUTE,
-    MAX_SATURATION_HEX,
-    SATURATION_MAX,
-    SATURATION_MIN,
-    SATURATION_ROUTE,
-    MIN_SATURATION_HEX,
-    POWER_OFF_HEX,
-    POWER_ON_HEX,
+    MODE_ROUTE,
+    POWER_ROUTE,
     SCENE_EFFECTS,
-    SCENE_HEX,
-    SCENE_HEX_DICT,
+    hs_from_device,
+    hs_to_device,
+)
+from .delivery import RedundantSender
+from .fade import FadeRunner, Frame, build_fade_frames, fade_fps
+from .metrics import CoordinatorMetrics
+from .osc import (
+    OSC_BUNDLE_TAG,
+    osc_bundle,
+    osc_route,
+    osc_split,
+)
+from .resolver import async_get_resolver
+from .routes import (
+    AUTO_PACKET,
+    BRIGHTNESS_LEVELS,
+    BRIGHTNESS_PACKETS,
+    MANUAL_PACKET,
+    MAX_SATURATION_PACKET,
+    MIN_SATURATION_PACKET,
+    POWER_OFF_PACKET,
+    POWER_ON_PACKET,
+    ROUTE_BRIGHTNESS,
+    ROUTE_HUE,
+    ROUTE_MODE,
+    ROUTE_POWER,
+    ROUTE_SATURATION,
+    ROUTE_SCENE,
+    ROUTE_SIZE,
+    ROUTE_SPEED,
+    ROUTES,
+    ROUTES_BY_ADDRESS,
+    SCENE_PACKET,
+    SCENE_PACKET_DICT,
+    brightness_from_device,
+)
+from .scheduler import (
+    PRIORITY_COLOR,
+    PRIORITY_POWER,
+    PRIORITY_TUNING,
+    PRIORITY_URGENT,
+    CoalescingSendQueue,
+)
+from .timeline import (
+    CHANNEL_BRIGHTNESS,
+    CHANNEL_HUE,
+    CHANNEL_SATURATION,
+    CHANNEL_SIZE,
+    CHANNEL_SPEED,
+    Keyframe,
+    compile_timeline,
+    final_values,
+    uses_hs_color,
+)
+from .state import FluoraState, LightState
+from .transport import Address, FluoraTransport, async_get_transport
+
+
+def encode_state(key: LightState, value: Any) -> tuple[str, tuple[bytes, ...]] | None:
+    """Encode a state change as a queue key and its ordered packet sequence.
+
+    Effects and HS colors share the mode key: both switch the device mode, so a newer
+    one of either always supersedes a pending one. Returns None for no-op changes.
+    """
+    if key == LightState.BRIGHTNESS:
+        return BRIGHTNESS_ROUTE, (BRIGHTNESS_PACKETS[max(0, min(255, int(value)))],)
+
+    if key == LightState.POWER:
+        return POWER_ROUTE, (POWER_ON_PACKET if value else POWER_OFF_PACKET,)
+
+    if key == LightState.EFFECT:
+        if value in SCENE_EFFECTS:
+            return MODE_ROUTE, (SCENE_PACKET, SCENE_PACKET_DICT[value])
+        if value == EFFECT_AUTO:
+            return MODE_ROUTE, (AUTO_PACKET,)
+        if value == EFFECT_WHITE:
+            return MODE_ROUTE, (MANUAL_PACKET, MIN_SATURATION_PACKET)
+        if value in COLOR_EFFECTS:
+            return MODE_ROUTE, (MANUAL_PACKET, MAX_SATURATION_PACKET, SCENE_PACKET_DICT[value])
+        # "Custom" is set by HS color control; selecting it directly is a no-op.
+        return None
+
+    if key == LightState.HS_COLOR:
+        # HA gives (hue_deg 0-360, sat_pct 0-100)
+        hue, sat = value
+        # Switch to manual mode then update palette.
+        return MODE_ROUTE, (MANUAL_PACKET, _SATURATION.encode(sat), _HUE.encode(hue))
+
+    if key == LightState.SPEED:
+        return MANUAL_SPEED_ROUTE, (_SPEED.encode(float(value)),)
+
+    if key == LightState.SIZE:
+        return MANUAL_SIZE_ROUTE, (_SIZE.encode(float(value)),)
+
+    return None
+
+
+# Send order for a batch of changes: power first, and the mode switch before the values
+# that only apply in that mode.
+STATE_ORDER: tuple[LightState, ...] = (
+    LightState.POWER,
+    LightState.BRIGHTNESS,
+    LightState.HS_COLOR,
+    LightState.EFFECT,
+    LightState.SPEED,
+    LightState.SIZE,
 )
 
 
-def scale_number(value: float, old_min: float, old_max: float, new_min: float, new_max: float) -> float:
-    return ((value - old_min) / (old_max - old_min)) * (new_max - new_min) + new_min
-
-
-def calculate_brightness_hex(desired_brightness: int) -> float:
-    # Device brightness curve approximation.
-    return scale_number((desired_brightness**0.1) - 1, 0, (100**0.1) - 1, 3932160, 4160442)
-
-
-class LightState(StrEnum):
-    """Coordinator state keys."""
-
-    BRIGHTNESS = ATTR_BRIGHTNESS
-    POWER = "power"
-    EFFECT = ATTR_EFFECT
-    HS_COLOR = ATTR_HS_COLOR
-    SPEED = "speed"
-    SIZE = "size"
-
-
-class LightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+def encode_changes(changes: dict[LightState, Any], use_bundles: bool = False) -> tuple[bytes, ...]:
+    """Encode a set of changes into one packet sequence in STATE_ORDER.
+
+    With use_bundles, more than one packet goes out as a single bundle.
+    """
+    packets = tuple(
+        packet
+        for key in STATE_ORDER
+        if key in changes and (encoded := encode_state(key, changes[key])) is not None
+        for packet in encoded[1]
+    )
+    if use_bundles and len(packets) > 1:
+        return (osc_bundle(packets),)
+    return packets
+
+
+_STATE_PRIORITY: dict[LightState, int] = {
+    LightState.POWER: PRIORITY_POWER,
+    LightState.BRIGHTNESS: PRIORITY_COLOR,
+    LightState.HS_COLOR: PRIORITY_COLOR,
+    LightState.EFFECT: PRIORITY_COLOR,
+    LightState.SPEED: PRIORITY_TUNING,
+    LightState.SIZE: PRIORITY_TUNING,
+}
+
+
+def state_priority(key: LightState, value: Any) -> int:
+    """Send queue priority for a state change; turning off preempts everything."""
+    if key == LightState.POWER and not value:
+        return PRIORITY_URGENT
+    return _STATE_PRIORITY[key]
+
+
+def overrides_fields(keys: tuple[LightState, ...], fields: frozenset[str]) -> bool:
+    """Whether a command setting keys replaces every field a transition drives."""
+    covered = set(keys)
+    if LightState.EFFECT in covered:
+        # A new effect replaces the color.
+        covered.add(LightState.HS_COLOR)
+    return fields <= covered
+
+
+# Backoff between background connection attempts, in seconds.
+CONNECT_RETRY_MIN = 5
+CONNECT_RETRY_MAX = 300
+
+_READBACK_TOLERANCE = 1e-5
+# Seconds a sent packet is remembered, so the device echoing it is not read back.
+_ECHO_WINDOW = 2.0
+
+# Read-back routes that report each state field.
+_FIELD_ROUTES: dict[LightState, tuple[str, ...]] = {
+    LightState.POWER: (ROUTE_POWER,),
+    LightState.BRIGHTNESS: (ROUTE_BRIGHTNESS,),
+    LightState.HS_COLOR: (ROUTE_HUE, ROUTE_SATURATION),
+    LightState.SPEED: (ROUTE_SPEED,),
+    LightState.SIZE: (ROUTE_SIZE,),
+}
+
+_HUE = ROUTES[ROUTE_HUE]
+_SATURATION = ROUTES[ROUTE_SATURATION]
+_SPEED = ROUTES[ROUTE_SPEED]
+_SIZE = ROUTES[ROUTE_SIZE]
+_MODE = ROUTES[ROUTE_MODE]
+_SCENE = ROUTES[ROUTE_SCENE]
+
+
+class LightCoordinator(DataUpdateCoordinator[FluoraState]):
     """Maintain local state and send UDP commands to the light."""
 
     def __init__(self, hass, device_id: str, conf: dict[str, Any]):
@@ -65,7 +221,7 @@ class LightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             logger=LOGGER,
             name=f"Fluora Light: {conf.get('name', '')}",
             update_method=self._async_update,
-            update_interval=None,  # optimistic/local state only
+            update_interval=None,  # optimistic, corrected by device read-back (no polling)
         )
 
         self.device_id = device_id
@@ -74,178 +230,664 @@ class LightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.port: int = conf["port"]
 
         self._initialized = False
-        self._ip_address: str | None = None
-        self._sock: socket.socket | None = None
+        self._address: Address | None = None
+        self._transport: FluoraTransport | None = None
+        self._untrack_hostname: CALLBACK_TYPE | None = None
+        # The background connect and the first commands may all try to connect at once.
+        self._connect_lock = asyncio.Lock()
+        # Re-apply the (restored) state once the light is first reached.
+        self._startup_send = bool(conf.get(CONF_STARTUP_SEND, DEFAULT_STARTUP_SEND))
+        self._restored: set[LightState] = set()
+
+        self._fade_fps = float(conf.get(CONF_TRANSITION_FPS, DEFAULT_TRANSITION_FPS))
+        self._fade: FadeRunner | None = None
+        self._timeline: FadeRunner | None = None
+
+        # Read-back from the device; None until the device has reported it.
+        self.has_feedback = False
+        # Last payload sent to or reported by the device per route, used to skip no-op packets.
+        self._shadow: dict[bytes, bytes] = {}
+        # Packets sent in the last _ECHO_WINDOW seconds, oldest first, with their send time.
+        self._recent: dict[bytes, float] = {}
+        self.skipped_packets = 0
+        self.metrics = CoordinatorMetrics()
         self._send_lock = asyncio.Lock()
+        # Firmware that accepts OSC bundles gets compound commands as a single datagram.
+        self.use_bundles: bool = bool(conf.get(CONF_USE_BUNDLES, DEFAULT_USE_BUNDLES))
+        # Commands are queued and paced; service calls return once they are enqueued.
+        self.send_queue = CoalescingSendQueue(
+            hass,
+            self.name,
+            self._async_send_packet,
+            float(conf.get(CONF_PACKET_GAP, DEFAULT_PACKET_GAP)) / 1000,
+            adaptive=bool(conf.get(CONF_ADAPTIVE_PACING, DEFAULT_ADAPTIVE_PACING)),
+            prepare=self.prepare_packets,
+        )
+        # Copies of final-state packets on lossy networks, stopped early by device echoes.
+        self.delivery = RedundantSender(
+            hass,
+            self.name,
+            self._send,
+            self._shadow.get,
+            int(conf.get(CONF_REDUNDANT_SENDS, DEFAULT_REDUNDANT_SENDS)),
+            on_loss=self.send_queue.async_report_loss,
+            on_lost=self._async_delivery_lost,
+        )
 
         # Default optimistic state (HA uses 0-255 brightness)
-        self.data = {
-            LightState.BRIGHTNESS: 255,
-            LightState.POWER: True,
-            LightState.EFFECT: EFFECT_AUTO,
-            LightState.HS_COLOR: (0.0, 100.0),
-            LightState.SPEED: 0.5,
-            LightState.SIZE: 0.5,
-        }
+        self.data = FluoraState(
+            brightness=255,
+            power=True,
+            effect=EFFECT_AUTO,
+            hs_color=(0.0, 100.0),
+            speed=0.5,
+            size=0.5,
+        )
+
+    @property
+    def state(self) -> FluoraState:
+        return self.data
+
+    @property
+    def address(self) -> Address | None:
+        """Resolved (ip, port) the light is sent to, once connected."""
+        return self._address
 
     @property
-    def state(self) -> dict[str, Any]:
+    def connected(self) -> bool:
+        """Whether the light has been reached since setup; stays True across reconnects."""
+        return self._address is not None
+
+    @property
+    def device_mode(self) -> int | None:
+        """Mode (auto, scene or manual) the device was last put in or reported."""
+        if (packet := self._shadow.get(_MODE.address)) is None:
+            return None
+        return int(_MODE.decode_device(packet))
+
+    @property
+    def scene_index(self) -> int | None:
+        """Scene the device was last set to or reported."""
+        if (packet := self._shadow.get(_SCENE.address)) is None:
+            return None
+        index = int(_SCENE.decode_device(packet))
+        return index if 0 <= index < len(SCENE_EFFECTS) else None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify every listener, whatever changed."""
+        self.data.take_dirty()
+        super().async_update_listeners()
+
+    @callback
+    def async_notify_changes(self) -> None:
+        """Notify only the listeners subscribed to fields changed since the last notification.
+
+        A listener's context is the state_mask of the fields it renders; listeners
+        without one hear about every change.
+        """
+        if not (dirty := self.data.take_dirty()):
+            return
+        for update_callback, fields in list(self._listeners.values()):
+            if fields is None or fields & dirty:
+                update_callback()
+
+    async def _async_update(self) -> FluoraState:
+        await self.async_ensure_connected()
         return self.data
 
-    async def _async_update(self) -> dict[str, Any]:
+    async def async_ensure_connected(self) -> None:
         if not self._initialized:
             await self._async_initialize()
-        return self.data
 
-    async def _async_initialize(self) -> None:
-        try:
-            self._ip_address = await self.hass.async_add_executor_job(
-                socket.gethostbyname, self.hostname
-            )
+    async def async_connect_in_background(self) -> None:
+        """Connect without blocking setup, retrying with backoff until the light is reached."""
+        delay = CONNECT_RETRY_MIN
+        while not self._initialized:
+            try:
+                await self._async_initialize()
+            except UpdateFailed as err:
+                LOGGER.debug("%s, retrying in %ss: %s", err, delay, err.__cause__)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, CONNECT_RETRY_MAX)
 
-            def _make_socket() -> socket.socket:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.settimeout(5)
-                sock.connect((self._ip_address, self.port))
-                sock.settimeout(None)
-                return sock
+    async def _async_initialize(self) -> None:
+        async with self._connect_lock:
+            if not self._initialized:
+                await self._async_connect()
 
-            self._sock = await self.hass.async_add_executor_job(_make_socket)
+    async def _async_connect(self) -> None:
+        try:
+            first_connect = self._address is None
+            resolver = async_get_resolver(self.hass)
+            # A reconnect follows a send error, so bypass the cache in case the light moved.
+            ip_address = await resolver.async_resolve(self.hostname, force=not first_connect)
+            if not first_connect:
+                self.metrics.reinitializations += 1
+
+            if self._transport is None:
+                self._transport = async_get_transport(self.hass)
+                self._transport.async_acquire()
+            await self._transport.async_open()
+
+            if first_connect:
+                self._untrack_hostname = resolver.async_track(self.hostname, self._async_address_changed)
+            self._async_set_address(ip_address)
             self._initialized = True
 
-            await self._async_send_hex(AUTO_HEX)
-            self.data[LightState.EFFECT] = EFFECT_AUTO
-            self.async_set_updated_data(self.data)
+            if first_connect:
+                if self._startup_send:
+                    self._shadow.clear()
+                    changes = self._full_state_changes()
+                    if LightState.POWER not in self._restored:
+                        # Leave the light on or off as it is rather than assume a default.
+                        del changes[LightState.POWER]
+                    self._async_enqueue_changes(changes)
+                # Entities become available.
+                self.async_update_listeners()
         except OSError as err:
             raise UpdateFailed(f"Failed to initialize Fluora Light at {self.hostname}:{self.port}") from err
 
+    @callback
+    def _async_set_address(self, ip_address: str) -> None:
+        assert self._transport is not None
+        if self._address is not None:
+            self._transport.async_unregister(self._address)
+        self._address = (ip_address, self.port)
+        self._transport.async_register(
+            self._address, self._async_mark_disconnected, self._async_datagram_received
+        )
+
+    @callback
+    def _async_address_changed(self, ip_address: str) -> None:
+        """Follow the light to its new address after a background re-resolve."""
+        if self._transport is not None:
+            self._async_set_address(ip_address)
+
     async def async_close(self) -> None:
-        sock = self._sock
-        self._sock = None
+        self._async_cancel_fade()
+        self.delivery.async_cancel()
+        await self.send_queue.async_close()
+        if self._untrack_hostname is not None:
+            self._untrack_hostname()
+            self._untrack_hostname = None
+        transport = self._transport
+        self._transport = None
         self._initialized = False
-        if sock is not None:
-            await self.hass.async_add_executor_job(sock.close)
+        if transport is not None:
+            if self._address is not None:
+                transport.async_unregister(self._address)
+            await transport.async_release()
+
+    @callback
+    def _async_mark_disconnected(self, exc: Exception) -> None:
+        """Reconnect on the next send after the transport reported an error for this light."""
+        LOGGER.debug("UDP transport error for %s: %s", self.hostname, exc)
+        self.metrics.send_errors += 1
+        self._initialized = False
+        self.send_queue.async_report_loss()
+
+    @callback
+    def _async_datagram_received(self, data: bytes) -> None:
+        """Apply state reported by the device, notifying only on actual changes."""
+        try:
+            raw_messages = osc_split(data)
+            # Routes the registry does not know are only kept in the shadow.
+            messages = [
+                (raw, codec.spec.key, codec.decode_device(raw))
+                for raw in raw_messages
+                if (codec := ROUTES_BY_ADDRESS.get(osc_route(raw))) is not None
+            ]
+        except ValueError as err:
+            LOGGER.debug("Ignoring undecodable packet from %s: %s", self.hostname, err)
+            return
+
+        # Echoes of our own packets confirm delivery but change nothing; a late echo of
+        # an older frame must not overwrite the shadow or the state either.
+        recent = self._recent
+        expired = time.monotonic() - _ECHO_WINDOW
+        echoes = {raw for raw in raw_messages if recent.get(raw, expired) > expired}
+        for raw in raw_messages:
+            self.delivery.async_ack(raw)
+            route = osc_route(raw)
+            if raw in echoes:
+                # Already in the shadow, unless delivery was given up on and the route forgotten.
+                self._shadow.setdefault(route, raw)
+            else:
+                self._shadow[route] = raw
+
+        self.send_queue.async_report_delivered()
+        # A running transition reports its intermediate frames; HA keeps showing its target.
+        driven = self._driven_routes()
+        changes: dict[LightState, Any] = {}
+        for raw, route_key, value in messages:
+            if raw not in echoes and route_key not in driven:
+                self._decode_message(route_key, value, changes)
+
+        self.data.update(changes)
+        if not self.has_feedback:
+            # Entities stop reporting an assumed state.
+            self.has_feedback = True
+            self.async_update_listeners()
+        else:
+            self.async_notify_changes()
+
+    def _driven_routes(self) -> set[str]:
+        """Read-back routes of the fields a running transition or timeline is streaming."""
+        routes: set[str] = set()
+        for runner in (self._fade, self._timeline):
+            if runner is not None and not runner.done.done():
+                for field in runner.fields:
+                    routes.update(_FIELD_ROUTES.get(field, ()))
+        return routes
+
+    def _decode_message(self, route_key: str, value: Any, changes: dict[LightState, Any]) -> None:
+        """Map one device value (in device units) back onto LightState (mirror of encode_state)."""
+        if route_key == ROUTE_BRIGHTNESS:
+            current = self.data[LightState.BRIGHTNESS]
+            # Several HA values share a device level; keep the current one if it matches.
+            if BRIGHTNESS_LEVELS[current] != value:
+                changes[LightState.BRIGHTNESS] = brightness_from_device(value)
+
+        elif route_key == ROUTE_POWER:
+            changes[LightState.POWER] = bool(value)
+
+        elif route_key == ROUTE_MODE:
+            mode = int(value)
+            if mode == DEVICE_MODE_AUTO:
+                changes[LightState.EFFECT] = EFFECT_AUTO
+            elif mode == DEVICE_MODE_SCENE and (index := self.scene_index) is not None:
+                changes[LightState.EFFECT] = SCENE_EFFECTS[index]
+            elif mode == DEVICE_MODE_MANUAL and self.data[LightState.EFFECT] in (
+                EFFECT_AUTO,
+                *SCENE_EFFECTS,
+            ):
+                changes[LightState.EFFECT] = EFFECT_CUSTOM
+
+        elif route_key == ROUTE_SCENE:
+            if 0 <= int(value) < len(SCENE_EFFECTS) and self.device_mode == DEVICE_MODE_SCENE:
+                changes[LightState.EFFECT] = SCENE_EFFECTS[int(value)]
+
+        elif route_key in (ROUTE_HUE, ROUTE_SATURATION):
+            hue, sat = hs_to_device(*changes.get(LightState.HS_COLOR, self.data[LightState.HS_COLOR]))
+            # Echoes of our own sends only differ by float32 rounding.
+            if route_key == ROUTE_HUE and abs(hue - value) > _READBACK_TOLERANCE:
+                changes[LightState.HS_COLOR] = hs_from_device(value, sat)
+            elif route_key == ROUTE_SATURATION and abs(sat - value) > _READBACK_TOLERANCE:
+                changes[LightState.HS_COLOR] = hs_from_device(hue, value)
+
+        elif route_key in (ROUTE_SPEED, ROUTE_SIZE):
+            key = LightState.SPEED if route_key == ROUTE_SPEED else LightState.SIZE
+            if abs(float(self.data[key]) - value) > _READBACK_TOLERANCE:
+                changes[key] = round(float(value), 4)
+
+    def _send(self, payload: bytes) -> None:
+        metrics = self.metrics
+        if self._transport is None or self._address is None:
+            metrics.send_errors += 1
+            raise UpdateFailed("Transport not initialized")
+        started = time.perf_counter_ns()
+        try:
+            self._transport.sendto(payload, self._address)
+        except UpdateFailed:
+            metrics.send_errors += 1
+            raise
+        metrics.send_latency.record(time.perf_counter_ns() - started)
+        metrics.packets += 1
+        metrics.bytes += len(payload)
+
+        recent = self._recent
+        now = time.monotonic()
+        for message in osc_split(payload) if payload.startswith(OSC_BUNDLE_TAG) else (payload,):
+            route = osc_route(message)
+            self._shadow[route] = message
+            recent.pop(message, None)
+            recent[message] = now
+            metrics.packets_by_route[route] += 1
+            metrics.bytes_by_route[route] += len(message)
+        expired = now - _ECHO_WINDOW
+        while (oldest := next(iter(recent), None)) is not None and recent[oldest] <= expired:
+            del recent[oldest]
+
+    def _send_final(self, payload: bytes) -> None:
+        """Send a packet that leaves the light in its final state, with copies if enabled."""
+        self._send(payload)
+        if self.delivery.enabled:
+            for message in osc_split(payload) if payload.startswith(OSC_BUNDLE_TAG) else (payload,):
+                self.delivery.async_track(message)
+
+    @callback
+    def _async_delivery_lost(self, packet: bytes) -> None:
+        """Forget a packet the device never acknowledged, so the next command resends it."""
+        route = osc_route(packet)
+        LOGGER.debug("%s never acknowledged %s", self.hostname, route.decode("ascii", "replace"))
+        if self._shadow.get(route) == packet:
+            del self._shadow[route]
+
+    def prepare_packets(self, packets: tuple[bytes, ...]) -> tuple[bytes, ...]:
+        """Drop packets the device already has, then bundle what is left if enabled."""
+        shadow = self._shadow
+        needed = tuple(packet for packet in packets if shadow.get(osc_route(packet)) != packet)
+        self.skipped_packets += len(packets) - len(needed)
+        if self.use_bundles and len(needed) > 1:
+            return (osc_bundle(needed),)
+        return needed
+
+    def snapshot_packets(self) -> tuple[bytes, ...]:
+        """Encode the complete current state as one ordered burst.
+
+        A light that is off gets its look first and the power-off last, so the next
+        turn-on shows the snapshot.
+        """
+        changes = self._full_state_changes()
+        if changes.pop(LightState.POWER):
+            return (POWER_ON_PACKET, *encode_changes(changes))
+        return (*encode_changes(changes), POWER_OFF_PACKET)
+
+    async def async_resync(self) -> None:
+        """Forget what the device is believed to have and resend the complete state."""
+        await self.async_ensure_connected()
+        self._async_cancel_fade()
+        self._shadow.clear()
+        self._async_enqueue_changes(self._full_state_changes())
+
+    def _full_state_changes(self) -> dict[LightState, Any]:
+        """Changes that put the light into the complete current state."""
+        changes = {
+            key: self.data[key]
+            for key in (LightState.POWER, LightState.BRIGHTNESS, LightState.SPEED, LightState.SIZE)
+        }
+        if (effect := self.data[LightState.EFFECT]) == EFFECT_CUSTOM:
+            changes[LightState.HS_COLOR] = self.data[LightState.HS_COLOR]
+        else:
+            changes[LightState.EFFECT] = effect
+        return changes
 
-    async def _async_send_hex(self, hex_payload: str) -> None:
+    async def _async_send_packet(self, payload: bytes) -> None:
         if not self._initialized:
             await self._async_initialize()
-        if self._sock is None:
-            raise UpdateFailed("Socket not initialized")
 
-        payload = bytearray.fromhex(hex_payload)
+        waited = time.perf_counter_ns()
         async with self._send_lock:
-            await self.hass.async_add_executor_job(self._sock.send, payload)
+            self.metrics.lock_wait.record(time.perf_counter_ns() - waited)
+            self._send_final(payload)
+        self.send_queue.async_report_delivered()
+
+    @callback
+    def async_send_now(self, payload: bytes) -> None:
+        """Send a packet immediately, bypassing the queue (used for synchronized fan-out)."""
+        self._send_final(payload)
+
+    @callback
+    def _async_cancel_fade(self, *keys: LightState) -> None:
+        """Stop a running transition or timeline before a new command.
+
+        Unless the command sets every field the transition drives, the transition
+        finishes instantly, so the fields the command leaves alone end up in the state
+        HA already shows.
+        """
+        for runner in (self._timeline, self._fade):
+            if runner is not None:
+                if not overrides_fields(keys, runner.fields):
+                    runner.async_finish()
+                runner.async_cancel()
+        self._timeline = None
+        self._fade = None
+
+    async def async_fade(self, changes: dict[LightState, Any], duration: float) -> None:
+        """Transition power, brightness and HS color to new values over duration seconds.
+
+        An effect in changes is not faded; it is queued as a normal command and
+        replaces any HS color.
+        """
+        await self.async_ensure_connected()
+        self._async_cancel_fade()
 
-    def _osc_payload(self, route: str, typetags: str, args: list[Any]) -> bytes:
-        """Create an OSC-like payload.
+        effect = changes.get(LightState.EFFECT)
+        if effect is not None and encode_state(LightState.EFFECT, effect) is None:
+            effect = None
 
-        The Fluora device speaks an OSC-style protocol: address string, type tags, then big-endian args.
-        """
+        was_on = bool(self.data[LightState.POWER])
+        power = bool(changes.get(LightState.POWER, was_on))
+        current = self.data[LightState.BRIGHTNESS]
 
-        def _pad4(b: bytes) -> bytes:
-            return b + (b"\x00" * ((4 - (len(b) % 4)) % 4))
+        lead: tuple[bytes, ...] = (POWER_ON_PACKET,) if power and not was_on else ()
+        tail: tuple[bytes, ...] = ()
+        if power:
+            target = changes.get(LightState.BRIGHTNESS, current)
+        else:
+            # Fade out, switch off, then restore the level so the next turn-on is not dark.
+            target = 0
+            tail = (POWER_OFF_PACKET, BRIGHTNESS_PACKETS[current])
+        start = current if was_on else 0
+
+        hs_color = None
+        if power and effect is None and LightState.HS_COLOR in changes:
+            hs_color = (self.data[LightState.HS_COLOR], changes[LightState.HS_COLOR])
+
+        fps = fade_fps(duration, self._fade_fps)
+        brightness = (start, target) if start != target or lead or tail else None
+        fields = {LightState.BRIGHTNESS} if brightness is not None else set()
+        if not power:
+            fields.add(LightState.POWER)
+        if hs_color is not None:
+            fields.add(LightState.HS_COLOR)
+
+        frames = build_fade_frames(
+            duration=duration,
+            fps=fps,
+            brightness=brightness,
+            hs_color=hs_color,
+            use_bundles=self.use_bundles,
+            lead=lead,
+            tail=tail,
+        )
+        self.send_queue.async_discard(POWER_ROUTE, BRIGHTNESS_ROUTE)
+        if hs_color is not None:
+            self.send_queue.async_discard(MODE_ROUTE)
+
+        self._fade = FadeRunner(
+            self.hass,
+            frames,
+            fps,
+            self._send,
+            final_send=self._send_final,
+            fields=frozenset(fields),
+        )
+        self._fade.async_start()
+
+        # HA shows the target state for the whole transition.
+        self.data[LightState.POWER] = power
+        if power:
+            self.data[LightState.BRIGHTNESS] = target
+        if hs_color is not None:
+            self.data[LightState.HS_COLOR] = hs_color[1]
+            self.data[LightState.EFFECT] = EFFECT_CUSTOM
+        elif power and effect is not None:
+            self.data.update(self._async_enqueue_changes({LightState.EFFECT: effect}))
+        self.async_notify_changes()
 
-        if not typetags.startswith(","):
-            raise ValueError("typetags must start with ',' (e.g. ',fi')")
+    def timeline_key(self, keyframes: list[Keyframe], fps: float | None = None) -> Hashable:
+        """Everything besides the keyframes that the compiled frames depend on.
 
-        addr = _pad4(route.encode("ascii") + b"\x00")
-        tags = _pad4(typetags.encode("ascii") + b"\x00")
+        Lights with equal keys can share one compiled timeline.
+        """
+        hs_color = self.data[LightState.HS_COLOR] if uses_hs_color(keyframes) else None
+        return fps or self._fade_fps, hs_color, self.use_bundles
 
-        out = bytearray()
-        out += addr
-        out += tags
+    async def async_compile_timeline(
+        self, keyframes: list[Keyframe], *, fps: float | None = None, loop: bool = False
+    ) -> list[Frame]:
+        """Compile keyframes for this light in the executor.
 
-        tag_list = typetags[1:]
-        if len(tag_list) != len(args):
-            raise ValueError("typetags and args length mismatch")
+        Raises ValueError if the timeline compiles to too many frames.
+        """
+        return await self.hass.async_add_executor_job(
+            partial(
+                compile_timeline,
+                keyframes,
+                fps=fps or self._fade_fps,
+                hs_color=self.data[LightState.HS_COLOR],
+                loop=loop,
+                use_bundles=self.use_bundles,
+            )
+        )
 
-        for tag, arg in zip(tag_list, args, strict=True):
-            if tag == "f":
-                out += struct.pack(">f", float(arg))
-            elif tag == "i":
-                out += struct.pack(">i", int(arg))
-            else:
-                raise ValueError(f"Unsupported OSC tag: {tag!r}")
+    async def async_play_timeline(
+        self,
+        keyframes: list[Keyframe],
+        *,
+        fps: float | None = None,
+        loop: bool = False,
+        frames: list[Frame] | None = None,
+    ) -> None:
+        """Stream a compiled keyframe timeline until it ends or any command cancels it.
+
+        frames may be shared with other lights of the same timeline_key; they are
+        compiled here when not given. Raises ValueError if the timeline compiles to
+        too many frames.
+        """
+        fps = fps or self._fade_fps
+        if frames is None:
+            frames = await self.async_compile_timeline(keyframes, fps=fps, loop=loop)
+        await self.async_ensure_connected()
+        self._async_cancel_fade()
+
+        values = final_values(keyframes)
+        animates_color = CHANNEL_HUE in values or CHANNEL_SATURATION in values
+        discard = [
+            route
+            for channel, route in (
+                (CHANNEL_BRIGHTNESS, BRIGHTNESS_ROUTE),
+                (CHANNEL_SPEED, MANUAL_SPEED_ROUTE),
+                (CHANNEL_SIZE, MANUAL_SIZE_ROUTE),
+            )
+            if channel in values
+        ]
+        if animates_color:
+            discard.append(MODE_ROUTE)
+        self.send_queue.async_discard(POWER_ROUTE, *discard)
+
+        # HA shows where the timeline ends (or, for a loop, where each pass ends).
+        end: dict[LightState, Any] = {}
+        if animates_color:
+            hue, sat = self.data[LightState.HS_COLOR]
+            end[LightState.HS_COLOR] = (
+                round(values.get(CHANNEL_HUE, hue) % 360.0, 2),
+                round(values.get(CHANNEL_SATURATION, sat), 2),
+            )
+        if CHANNEL_BRIGHTNESS in values:
+            end[LightState.BRIGHTNESS] = max(0, min(255, round(values[CHANNEL_BRIGHTNESS])))
+        for channel, key in ((CHANNEL_SPEED, LightState.SPEED), (CHANNEL_SIZE, LightState.SIZE)):
+            if channel in values:
+                end[key] = max(0.0, min(1.0, values[channel]))
+        # Later frames only carry what changed, so stopping early sends the end state in full.
+        final = encode_changes(end, self.use_bundles)
+
+        # Power and mode are set once up front rather than on every pass of a loop.
+        lead = (POWER_ON_PACKET, MANUAL_PACKET) if animates_color else (POWER_ON_PACKET,)
+        for packet in self.prepare_packets(lead):
+            self._send_final(packet)
+
+        self._timeline = FadeRunner(
+            self.hass,
+            frames,
+            fps,
+            self._send,
+            loop=loop,
+            final_send=self._send_final,
+            final=final,
+            fields=frozenset(end),
+        )
+        self._timeline.async_start()
 
-        return bytes(out)
+        self.data[LightState.POWER] = True
+        self.data.update(end)
+        if animates_color:
+            self.data[LightState.EFFECT] = EFFECT_CUSTOM
+        self.async_notify_changes()
+
+    @callback
+    def async_pause_timeline(self) -> None:
+        if self._timeline is not None:
+            self._timeline.async_pause()
+
+    @callback
+    def async_resume_timeline(self) -> None:
+        if self._timeline is not None:
+            self._timeline.async_resume()
+
+    @callback
+    def async_stop_timeline(self) -> None:
+        """Stop a timeline and send its end state, which is the state HA shows."""
+        if (timeline := self._timeline) is not None:
+            self._timeline = None
+            timeline.async_finish()
+            timeline.async_cancel()
+
+    @callback
+    def async_interrupt(self, changes: dict[LightState, Any]) -> None:
+        """Clear the way for changes that are about to be sent outside the queue.
+
+        Call before the first packet goes out: a running transition or timeline stops
+        (finishing first unless the changes replace it), and anything still queued for
+        the same routes is dropped, so neither can overwrite the new packets.
+        """
+        self._async_cancel_fade(*changes)
+        for key, value in changes.items():
+            if (encoded := encode_state(key, value)) is not None:
+                self.send_queue.async_discard(encoded[0])
+
+    @callback
+    def async_apply_state(self, changes: dict[LightState, Any]) -> None:
+        """Record state that was sent outside the queue and notify listeners once."""
+        for key, value in changes.items():
+            self.data[key] = value
+            if key == LightState.HS_COLOR:
+                self.data[LightState.EFFECT] = EFFECT_CUSTOM
+        self.async_notify_changes()
+
+    @callback
+    def async_restore_state(self, changes: dict[LightState, Any]) -> None:
+        """Seed state restored by an entity after a restart; nothing is sent or notified."""
+        self.data.restore(changes)
+        self._restored.update(changes)
+
+    @callback
+    def _async_enqueue_changes(self, changes: dict[LightState, Any]) -> dict[LightState, Any]:
+        """Queue the packets for a set of changes in STATE_ORDER; return what was queued."""
+        queued: dict[LightState, Any] = {}
+        for key in STATE_ORDER:
+            if key not in changes:
+                continue
+            if (encoded := encode_state(key, changes[key])) is None:
+                continue
+            self.send_queue.async_enqueue(
+                encoded[0], *encoded[1], priority=state_priority(key, changes[key])
+            )
+            queued[key] = changes[key]
+        return queued
 
-    async def _async_send_osc(self, route: str, typetags: str, args: list[Any]) -> None:
-        payload = self._osc_payload(route, typetags, args)
-        async with self._send_lock:
-            if not self._initialized:
-                await self._async_initialize()
-            if self._sock is None:
-                raise UpdateFailed("Socket not initialized")
-            await self.hass.async_add_executor_job(self._sock.send, payload)
+    async def async_update_states(self, changes: dict[LightState, Any]) -> bool:
+        """Apply several state changes as one transaction.
 
-    async def async_update_state(self, key: LightState, value: Any) -> bool:
+        All packets are queued in one go, so the send queue dispatches them back to
+        back, and listeners are notified once. Returns False if nothing was sent.
+        """
         if not self._initialized:
             await self._async_initialize()
 
-        if key == LightState.BRIGHTNESS:
-            desired_brightness = round(int(value) * 100 / 255)
-            brightness_hex_value = int(calculate_brightness_hex(desired_brightness))
-            brightness_hex = f"{brightness_hex_value:06x}"
-            await self._async_send_hex(BRIGHTNESS_HEX_FIRST + brightness_hex + BRIGHTNESS_HEX_LAST)
-
-        elif key == LightState.EFFECT:
-            if value in SCENE_EFFECTS:
-                await self._async_send_hex(SCENE_HEX)
-                await asyncio.sleep(0.1)
-                await self._async_send_hex(SCENE_HEX_DICT[value])
-            elif value == EFFECT_AUTO:
-                await self._async_send_hex(AUTO_HEX)
-            elif value == EFFECT_WHITE:
-                await self._async_send_hex(MANUAL_HEX)
-                await asyncio.sleep(0.1)
-                await self._async_send_hex(MIN_SATURATION_HEX)
-            elif value in COLOR_EFFECTS:
-                await self._async_send_hex(MANUAL_HEX)
-                await asyncio.sleep(0.1)
-                await self._async_send_hex(MAX_SATURATION_HEX)
-                await asyncio.sleep(0.1)
-                await self._async_send_hex(SCENE_HEX_DICT[value])
-            elif value == EFFECT_CUSTOM:
-                # "Custom" is set by HS color control; selecting it directly is a no-op.
-                return False
-            else:
-                return False
-
-        elif key == LightState.POWER:
-            await self._async_send_hex(POWER_ON_HEX if value else POWER_OFF_HEX)
-
-        elif key == LightState.HS_COLOR:
-            # HA gives (hue_deg 0-360, sat_pct 0-100)
-            hue_deg, sat_pct = value
-
-            # Convert to the device's 0..1 float space (with a hue wheel offset).
-            hue = (float(hue_deg) / 360.0 + HUE_OFFSET) % 1.0
-
-            sat_pct = max(0.0, min(100.0, float(sat_pct)))
-            sat = SATURATION_MIN + (sat_pct / 100.0) * (SATURATION_MAX - SATURATION_MIN)
-
-            # Switch to manual mode then update palette.
-            await self._async_send_hex(MANUAL_HEX)
-            await asyncio.sleep(0.05)
-            await self._async_send_osc(SATURATION_ROUTE, ",fi", [sat, 0])
-            await asyncio.sleep(0.05)
-            await self._async_send_osc(HUE_ROUTE, ",fi", [hue, 0])
+        self._async_cancel_fade(*changes)
+        queued = self._async_enqueue_changes(changes)
+        if not queued:
+            return False
 
+        if LightState.HS_COLOR in queued:
             # reflect state in HA
             self.data[LightState.EFFECT] = EFFECT_CUSTOM
-
-        elif key == LightState.SPEED:
-            speed = max(0.0, min(1.0, float(value)))
-            await self._async_send_osc(MANUAL_SPEED_ROUTE, ",fi", [speed, 0])
-
-        elif key == LightState.SIZE:
-            size = max(0.0, min(1.0, float(value)))
-            await self._async_send_osc(MANUAL_SIZE_ROUTE, ",fi", [size, 0])
-
-        else:
-            return False
-
-        self.data[key] = value
-        self.async_set_updated_data(self.data)
+        self.data.update(queued)
+        self.async_notify_changes()
         return True
 
+    async def async_update_state(self, key: LightState, value: Any) -> bool:
+        return await self.async_update_states({key: value})
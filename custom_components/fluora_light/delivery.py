@@ -0,0 +1,173 @@
+"""Redundant delivery of final-state packets, acknowledged by device echoes."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import random
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import LOGGER
+from .osc import osc_route
+
+# Seconds between copies of a packet, and how long an echo gets to acknowledge it.
+REDUNDANT_SPACING = 0.15
+# Each wait is randomized by this fraction so copies to many lights do not line up.
+REDUNDANT_JITTER = 0.5
+# Weight of the newest sample in the loss-rate moving average.
+LOSS_ALPHA = 0.05
+
+
+@dataclass(slots=True)
+class _Tracked:
+    packet: bytes
+    remaining: int
+    attempts: int
+    handle: asyncio.TimerHandle | None = None
+
+
+class RedundantSender:
+    """Re-send the latest packet per route until the device echoes it or copies run out.
+
+    Every packet carries an absolute value, so a duplicate is harmless. Until the device
+    has echoed anything, all copies go out blind. Once it echoes, an echo of the packet
+    acknowledges it and ends the copies, so extra traffic follows the actual loss. A
+    first send that is not acknowledged in time counts towards the loss estimate, and
+    one that is never acknowledged is reported through on_lost. current returns what
+    was last sent on a route, so copies stop once anything else went out there.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        send: Callable[[bytes], None],
+        current: Callable[[bytes], bytes | None],
+        copies: int,
+        *,
+        on_loss: Callable[[], None] | None = None,
+        on_lost: Callable[[bytes], None] | None = None,
+        spacing: float = REDUNDANT_SPACING,
+    ) -> None:
+        self._loop = hass.loop
+        self._name = name
+        self._send = send
+        self._current = current
+        self._on_loss = on_loss
+        self._on_lost = on_lost
+        self._spacing = spacing
+        self.copies = copies
+        self._tracked: dict[bytes, _Tracked] = {}
+
+        # Whether the device has echoed anything, which makes acknowledgements possible.
+        self.echoing = False
+        self.tracked = 0
+        self.acknowledged = 0
+        self.resent = 0
+        # Acknowledged only after a copy.
+        self.recovered = 0
+        # Never acknowledged by an echoing device.
+        self.lost = 0
+        self.loss_rate: float | None = None
+
+    @property
+    def enabled(self) -> bool:
+        # Without copies, tracking still measures loss once the device echoes.
+        return self.copies > 0 or self.echoing
+
+    def _delay(self) -> float:
+        return self._spacing * random.uniform(1.0 - REDUNDANT_JITTER, 1.0 + REDUNDANT_JITTER)
+
+    def _sample_loss(self, lost: bool) -> None:
+        sample = 1.0 if lost else 0.0
+        if self.loss_rate is None:
+            self.loss_rate = sample
+        else:
+            self.loss_rate += LOSS_ALPHA * (sample - self.loss_rate)
+
+    @callback
+    def async_track(self, message: bytes) -> None:
+        """Start copies of a just-sent message, superseding any for the same route."""
+        if not self.enabled:
+            return
+        route = osc_route(message)
+        if (previous := self._tracked.get(route)) is not None and previous.handle is not None:
+            previous.handle.cancel()
+        tracked = self._tracked[route] = _Tracked(message, self.copies, 1)
+        tracked.handle = self._loop.call_later(self._delay(), self._async_resend, route)
+        self.tracked += 1
+
+    @callback
+    def async_ack(self, message: bytes) -> None:
+        """Handle a message the device sent; an echo of a tracked packet acknowledges it."""
+        self.echoing = True
+        route = osc_route(message)
+        if (tracked := self._tracked.pop(route, None)) is None:
+            return
+        if tracked.handle is not None:
+            tracked.handle.cancel()
+        # A different value means the device reports newer state; nothing left to resend.
+        if tracked.packet != message:
+            return
+        self.acknowledged += 1
+        if tracked.attempts == 1:
+            self._sample_loss(False)
+        else:
+            self.recovered += 1
+
+    @callback
+    def _async_resend(self, route: bytes) -> None:
+        if (tracked := self._tracked.get(route)) is None:
+            return
+        tracked.handle = None
+        if self._current(route) != tracked.packet:
+            # Superseded by an untracked send, such as a transition frame.
+            del self._tracked[route]
+            return
+        if self.echoing and tracked.attempts == 1:
+            self._sample_loss(True)
+            if self._on_loss is not None:
+                self._on_loss()
+
+        if tracked.remaining <= 0:
+            del self._tracked[route]
+            if self.echoing:
+                self.lost += 1
+                if self._on_lost is not None:
+                    self._on_lost(tracked.packet)
+            return
+
+        try:
+            self._send(tracked.packet)
+        except UpdateFailed as err:
+            LOGGER.debug("%s: giving up on redundant sends: %s", self._name, err)
+            del self._tracked[route]
+            return
+        tracked.remaining -= 1
+        tracked.attempts += 1
+        self.resent += 1
+        tracked.handle = self._loop.call_later(self._delay(), self._async_resend, route)
+
+    @callback
+    def async_cancel(self) -> None:
+        for tracked in self._tracked.values():
+            if tracked.handle is not None:
+                tracked.handle.cancel()
+        self._tracked.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "copies": self.copies,
+            "echoing": self.echoing,
+            "in_flight": len(self._tracked),
+            "tracked": self.tracked,
+            "acknowledged": self.acknowledged,
+            "resent": self.resent,
+            "recovered": self.recovered,
+            "lost": self.lost,
+            "loss_rate": self.loss_rate,
+        }
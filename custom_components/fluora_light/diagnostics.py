@@ -0,0 +1,54 @@
+"""Diagnostics support for Fluora Light."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import LightCoordinator
+from .transport import DATA_TRANSPORT
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return runtime metrics for a config entry."""
+    coordinator: LightCoordinator = hass.data[DOMAIN][entry.entry_id]
+    queue = coordinator.send_queue
+
+    transport_stats = None
+    if (address := coordinator.address) is not None and (
+        transport := hass.data[DOMAIN].get(DATA_TRANSPORT)
+    ) is not None:
+        if (stats := transport.stats.get(address)) is not None:
+            transport_stats = {
+                "packets": stats.packets,
+                "bytes": stats.bytes,
+                "errors": stats.errors,
+                "received": stats.received,
+                "last_error": stats.last_error,
+            }
+
+    return {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "state": coordinator.data.as_dict(),
+        "state_versions": {str(key): coordinator.data.version(key) for key in coordinator.data},
+        "device_mode": coordinator.device_mode,
+        "has_feedback": coordinator.has_feedback,
+        "metrics": coordinator.metrics.as_dict(),
+        "send_queue": {
+            "depth": queue.depth,
+            "packet_gap_ms": queue.packet_gap * 1000,
+            "sent": queue.sent,
+            "coalesced": queue.coalesced,
+            "preempted": queue.preempted,
+            "dropped": queue.dropped,
+            "paced_seconds": queue.paced_seconds,
+        },
+        "skipped_packets": coordinator.skipped_packets,
+        "delivery": coordinator.delivery.as_dict(),
+        "transport": transport_stats,
+    }
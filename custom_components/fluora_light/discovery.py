@@ -0,0 +1,94 @@
+"""Concurrent UDP probing of a subnet for Fluora panels."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import ipaddress
+import socket
+from typing import Any
+
+from .const import DEFAULT_PORT
+from .osc import osc_message
+
+# A no-op message: panels echo what they receive, and an unknown route changes nothing.
+PROBE_ROUTE = "/fluora_light/probe"
+PROBE_PACKET = osc_message(PROBE_ROUTE, ",", [])
+
+# Probes in flight at once; with the timeout below a /24 takes about a second.
+SCAN_CONCURRENCY = 64
+# Seconds a host gets to answer, split across the probe attempts.
+SCAN_TIMEOUT = 0.25
+SCAN_ATTEMPTS = 2
+# Largest subnet accepted for a scan (a /22).
+MAX_SCAN_HOSTS = 1024
+
+
+def subnet_hosts(subnet: str) -> list[str]:
+    """Host addresses of an IPv4 subnet such as 192.168.1.0/24.
+
+    Raises ValueError for an invalid subnet or one larger than MAX_SCAN_HOSTS.
+    """
+    network = ipaddress.IPv4Network(subnet, strict=False)
+    if network.num_addresses > MAX_SCAN_HOSTS:
+        raise ValueError(f"Subnet {network} has more than {MAX_SCAN_HOSTS} addresses")
+    return [str(host) for host in network.hosts()]
+
+
+class _ProbeProtocol(asyncio.DatagramProtocol):
+    """Records which probed hosts answered from the probed port."""
+
+    def __init__(self, port: int) -> None:
+        self._port = port
+        self.answered: set[str] = set()
+        self.waiters: dict[str, asyncio.Future[None]] = {}
+
+    def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+        host = addr[0]
+        if addr[1] != self._port:
+            return
+        self.answered.add(host)
+        if (waiter := self.waiters.get(host)) is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def error_received(self, exc: Exception) -> None:
+        """ICMP errors only mean a host has no listener on the port."""
+
+
+async def async_scan(
+    hosts: Iterable[str],
+    port: int = DEFAULT_PORT,
+    *,
+    concurrency: int = SCAN_CONCURRENCY,
+    timeout: float = SCAN_TIMEOUT,
+    attempts: int = SCAN_ATTEMPTS,
+) -> list[str]:
+    """Probe hosts concurrently from one socket; return those that answered, in order.
+
+    At most concurrency hosts are probed at a time. Each gets attempts probes spread
+    over timeout seconds and is done as soon as it answers; late answers still count.
+    """
+    hosts = list(hosts)
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: _ProbeProtocol(port), local_addr=("0.0.0.0", 0), family=socket.AF_INET
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _async_probe(host: str) -> None:
+        async with semaphore:
+            waiter = protocol.waiters[host] = loop.create_future()
+            try:
+                for _ in range(attempts):
+                    transport.sendto(PROBE_PACKET, (host, port))
+                    done, _ = await asyncio.wait((waiter,), timeout=timeout / attempts)
+                    if done:
+                        return
+            finally:
+                del protocol.waiters[host]
+
+    try:
+        await asyncio.gather(*(_async_probe(host) for host in hosts))
+    finally:
+        transport.close()
+    return [host for host in hosts if host in protocol.answered]
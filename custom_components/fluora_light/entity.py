@@ -7,13 +7,21 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import LightCoordinator
+from .state import LightState, state_mask
 
 
 class FluoraLightBaseEntity(CoordinatorEntity[LightCoordinator]):
     """Fluora Light base entity class."""
 
-    def __init__(self, coordinator: LightCoordinator, description: EntityDescription):
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        coordinator: LightCoordinator,
+        description: EntityDescription,
+        fields: tuple[LightState, ...] = (),
+    ):
+        # State is only written when one of the fields this entity renders changes;
+        # availability and feedback changes reach every entity.
+        super().__init__(coordinator, context=state_mask(*fields))
         self.entity_description = description
 
         self._attr_unique_id = f"{coordinator.hostname}-{description.key}"
@@ -22,3 +30,7 @@ class FluoraLightBaseEntity(CoordinatorEntity[LightCoordinator]):
             "name": coordinator.name,
             "manufacturer": "Fluora",
         }
+
+    @property
+    def available(self) -> bool:
+        return super().available and self.coordinator.connected
@@ -0,0 +1,196 @@
+"""Client-side transitions for Fluora lights."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import LOGGER, hs_to_device
+from .osc import osc_bundle
+from .routes import BRIGHTNESS_PACKETS, MANUAL_PACKET, ROUTE_HUE, ROUTE_SATURATION, ROUTES
+
+Frame = tuple[bytes, ...]
+
+_HUE = ROUTES[ROUTE_HUE]
+_SATURATION = ROUTES[ROUTE_SATURATION]
+
+# Upper bound on precomputed fade frames (5 minutes at 20 fps); longer fades use fewer
+# frames per second instead.
+MAX_FADE_FRAMES = 6_000
+
+
+def fade_fps(duration: float, fps: float) -> float:
+    """Frame rate for a fade of duration seconds, lowered so it fits MAX_FADE_FRAMES."""
+    if duration * fps > MAX_FADE_FRAMES:
+        return MAX_FADE_FRAMES / duration
+    return fps
+
+
+def interpolate_hs(
+    start: tuple[float, float], end: tuple[float, float], t: float
+) -> tuple[float, float]:
+    """Interpolate HA hue/saturation, taking the shortest way around the hue wheel."""
+    delta = ((end[0] - start[0] + 180.0) % 360.0) - 180.0
+    return (start[0] + delta * t) % 360.0, start[1] + (end[1] - start[1]) * t
+
+
+def build_fade_frames(
+    *,
+    duration: float,
+    fps: float,
+    brightness: tuple[int, int] | None = None,
+    hs_color: tuple[tuple[float, float], tuple[float, float]] | None = None,
+    use_bundles: bool = False,
+    lead: Frame = (),
+    tail: Frame = (),
+) -> list[Frame]:
+    """Precompute every frame of a fade as ready-to-send packets.
+
+    Brightness steps through the precompiled device curve and frames that would repeat
+    the previous packets are dropped, so the send loop does no encoding at all. The
+    device hue offset is applied by hs_to_device after interpolating in HA space.
+    Frame 0 carries the starting values; frame N is due N / fps seconds after it.
+    Long fades get at most MAX_FADE_FRAMES frames; pass fade_fps(duration, fps) as fps.
+    """
+    count = max(1, min(MAX_FADE_FRAMES, round(duration * fps)))
+    frames: list[Frame] = []
+    previous: Frame | None = None
+
+    for index in range(count + 1):
+        t = index / count
+        packets: list[bytes] = []
+        if index == 0:
+            packets.extend(lead)
+            if hs_color is not None:
+                packets.append(MANUAL_PACKET)
+
+        if hs_color is not None:
+            hue, sat = hs_to_device(*interpolate_hs(hs_color[0], hs_color[1], t))
+            packets.append(_SATURATION.encode_device(sat))
+            packets.append(_HUE.encode_device(hue))
+
+        if brightness is not None:
+            level = round(brightness[0] + (brightness[1] - brightness[0]) * t)
+            packets.append(BRIGHTNESS_PACKETS[max(0, min(255, level))])
+
+        if index == count:
+            packets.extend(tail)
+
+        frame = tuple(packets)
+        if frame == previous and index != count:
+            # Keep the frame slot (timing) but send nothing.
+            frames.append(())
+            continue
+        previous = frame
+        frames.append((osc_bundle(frame),) if use_bundles and len(frame) > 1 else frame)
+
+    return frames
+
+
+class FadeRunner:
+    """Stream precomputed frames on the loop clock.
+
+    Frame N is due at start + N / fps, so a late frame does not push back later ones.
+    Each frame is a plain call_at callback; no task or coroutine runs per frame.
+    With loop set the frames repeat until cancelled. The final frame of a run that
+    ends goes through final_send when given. Frames may only carry what changed since
+    the previous one, so final gives the complete end state for async_finish; it
+    defaults to the last frame. fields names the state fields the frames drive, so the
+    owner can tell whether a new command replaces all of them.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        frames: list[Frame],
+        fps: float,
+        send: Callable[[bytes], None],
+        loop: bool = False,
+        final_send: Callable[[bytes], None] | None = None,
+        final: Frame | None = None,
+        fields: frozenset[str] = frozenset(),
+    ) -> None:
+        self._loop = hass.loop
+        self._frames = frames
+        self._interval = 1.0 / fps
+        self._send = send
+        # The last frame of a run that ends leaves the light in its final state.
+        self._final_send = final_send or send
+        self._repeat = loop
+        self._final = frames[-1] if final is None else final
+        self.fields = fields
+        self._index = 0
+        self._start = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+        self.paused = False
+        self.done: asyncio.Future[None] = self._loop.create_future()
+
+    @callback
+    def async_start(self) -> None:
+        self._start = self._loop.time()
+        self._async_frame()
+
+    @callback
+    def async_finish(self) -> None:
+        """Stop streaming and send the end state straight away."""
+        if self.done.done():
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        try:
+            for packet in self._final:
+                self._final_send(packet)
+        except UpdateFailed as err:
+            LOGGER.debug("Transition aborted: %s", err)
+        self.async_cancel()
+
+    @callback
+    def async_pause(self) -> None:
+        if self._handle is not None and not self.paused:
+            self._handle.cancel()
+            self._handle = None
+            self.paused = True
+
+    @callback
+    def async_resume(self) -> None:
+        """Continue from the next frame as if the pause had not happened."""
+        if self.paused and not self.done.done():
+            self.paused = False
+            self._start = self._loop.time() - self._index * self._interval
+            self._async_frame()
+
+    @callback
+    def async_cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self.done.done():
+            self.done.set_result(None)
+
+    @callback
+    def _async_frame(self) -> None:
+        final = not self._repeat and self._index == len(self._frames) - 1
+        send = self._final_send if final else self._send
+        try:
+            for packet in self._frames[self._index]:
+                send(packet)
+        except UpdateFailed as err:
+            LOGGER.debug("Transition aborted: %s", err)
+            self.async_cancel()
+            return
+
+        self._index += 1
+        if self._index >= len(self._frames):
+            if not self._repeat:
+                self._handle = None
+                self.async_cancel()
+                return
+            self._index = 0
+            self._start += len(self._frames) * self._interval
+        self._handle = self._loop.call_at(
+            self._start + self._index * self._interval, self._async_frame
+        )
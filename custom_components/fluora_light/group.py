@@ -0,0 +1,80 @@
+"""Synchronized command fan-out to many Fluora lights."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from typing import Any
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import LOGGER
+from .coordinator import STATE_ORDER, LightCoordinator, LightState, encode_changes, encode_state
+
+
+async def async_connect_all(coordinators: Sequence[LightCoordinator]) -> list[LightCoordinator]:
+    """Connect lights concurrently and return the reachable ones."""
+    results = await asyncio.gather(
+        *(coordinator.async_ensure_connected() for coordinator in coordinators),
+        return_exceptions=True,
+    )
+    targets = [
+        coordinator
+        for coordinator, result in zip(coordinators, results, strict=True)
+        if not isinstance(result, Exception)
+    ]
+    if len(targets) != len(coordinators):
+        LOGGER.warning(
+            "Group command skipped %d unreachable Fluora light(s)", len(coordinators) - len(targets)
+        )
+    return targets
+
+
+async def async_send_lockstep(bursts: dict[LightCoordinator, Sequence[bytes]]) -> None:
+    """Send step N of every light's burst in one tight loop before any step N + 1.
+
+    Packets bypass each light's send queue and its token bucket: steps are spaced by
+    the largest configured packet gap instead, without adaptive pacing.
+    """
+    gap = max((coordinator.send_queue.packet_gap for coordinator in bursts), default=0.0)
+    steps = max((len(packets) for packets in bursts.values()), default=0)
+
+    for index in range(steps):
+        if index:
+            await asyncio.sleep(gap)
+        for coordinator, packets in bursts.items():
+            if index >= len(packets):
+                continue
+            try:
+                coordinator.async_send_now(packets[index])
+            except UpdateFailed as err:
+                LOGGER.debug("Group send to %s failed: %s", coordinator.hostname, err)
+
+
+async def async_send_group(
+    coordinators: Sequence[LightCoordinator], changes: dict[LightState, Any]
+) -> None:
+    """Send the same changes to many lights in lockstep.
+
+    Each step goes to every light in one tight loop before the next step starts, so
+    every light switches mode before any light gets its color. Running transitions
+    and queued commands are stopped first, so they cannot overwrite the burst.
+    """
+    # Only what is actually sent is recorded, as for a single light.
+    changes = {
+        key: changes[key]
+        for key in STATE_ORDER
+        if key in changes and encode_state(key, changes[key]) is not None
+    }
+    if not coordinators or not changes:
+        return
+
+    targets = await async_connect_all(coordinators)
+    for coordinator in targets:
+        coordinator.async_interrupt(changes)
+    # Encoded once, into the packets every light receives.
+    steps = encode_changes(changes, all(coordinator.use_bundles for coordinator in targets))
+    await async_send_lockstep({coordinator: steps for coordinator in targets})
+
+    for coordinator in targets:
+        coordinator.async_apply_state(changes)
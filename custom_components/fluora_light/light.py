@@ -6,13 +6,16 @@ from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_EFFECT,
     ATTR_HS_COLOR,
+    ATTR_TRANSITION,
     ColorMode,
     LightEntity,
     LightEntityDescription,
     LightEntityFeature,
 )
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoredExtraData, RestoreEntity
 from homeassistant.config_entries import ConfigEntry
 
 from .const import DOMAIN, EFFECT_LIST
@@ -24,6 +27,8 @@ LIGHT_DESCRIPTION = LightEntityDescription(
     key="light",
     name="Light",
 )
+# State fields the light entity renders.
+LIGHT_FIELDS = (LightState.POWER, LightState.BRIGHTNESS, LightState.HS_COLOR, LightState.EFFECT)
 
 
 async def async_setup_entry(
@@ -32,21 +37,56 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator: LightCoordinator = hass.data[DOMAIN][config_entry.entry_id]
-    async_add_entities([FluoraLightEntity(coordinator, LIGHT_DESCRIPTION)], update_before_add=True)
+    async_add_entities([FluoraLightEntity(coordinator, LIGHT_DESCRIPTION)])
 
 
-class FluoraLightEntity(FluoraLightBaseEntity, LightEntity):
+class FluoraLightEntity(FluoraLightBaseEntity, LightEntity, RestoreEntity):
     """Representation of a Fluora Light."""
 
     _attr_has_entity_name = True
     _attr_supported_color_modes = {ColorMode.HS, ColorMode.BRIGHTNESS}
-    _attr_supported_features = LightEntityFeature.EFFECT
-    _attr_assumed_state = True
+    _attr_supported_features = LightEntityFeature.EFFECT | LightEntityFeature.TRANSITION
 
     def __init__(self, coordinator: LightCoordinator, description: LightEntityDescription) -> None:
-        super().__init__(coordinator, description)
+        super().__init__(coordinator, description, LIGHT_FIELDS)
         self._attr_effect_list = EFFECT_LIST
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is None:
+            return
+
+        changes: dict[LightState, Any] = {}
+        # Whether a light that was unreachable before the restart is on is not known.
+        if last_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            changes[LightState.POWER] = last_state.state == STATE_ON
+        # The look is kept as extra data because an off light has no attributes.
+        if (extra := await self.async_get_last_extra_data()) is not None:
+            look = extra.as_dict()
+            if look.get(ATTR_BRIGHTNESS) is not None:
+                changes[LightState.BRIGHTNESS] = int(look[ATTR_BRIGHTNESS])
+            if look.get(ATTR_HS_COLOR) is not None:
+                changes[LightState.HS_COLOR] = tuple(look[ATTR_HS_COLOR])
+            if look.get(ATTR_EFFECT) in EFFECT_LIST:
+                changes[LightState.EFFECT] = look[ATTR_EFFECT]
+        self.coordinator.async_restore_state(changes)
+
+    @property
+    def extra_restore_state_data(self) -> ExtraStoredData:
+        state = self.coordinator.state
+        return RestoredExtraData(
+            {
+                ATTR_BRIGHTNESS: state[LightState.BRIGHTNESS],
+                ATTR_HS_COLOR: list(state[LightState.HS_COLOR]),
+                ATTR_EFFECT: state[LightState.EFFECT],
+            }
+        )
+
+    @property
+    def assumed_state(self) -> bool:
+        # State is optimistic until the device has reported anything back.
+        return not self.coordinator.has_feedback
+
     @property
     def color_mode(self) -> ColorMode:
         return ColorMode.HS
@@ -68,18 +108,25 @@ class FluoraLightEntity(FluoraLightBaseEntity, LightEntity):
         return bool(self.coordinator.state[LightState.POWER])
 
     async def async_turn_on(self, **kwargs: Any) -> None:
+        changes: dict[LightState, Any] = {}
         if not self.is_on:
-            await self.coordinator.async_update_state(LightState.POWER, True)
-
+            changes[LightState.POWER] = True
         if ATTR_BRIGHTNESS in kwargs:
-            await self.coordinator.async_update_state(LightState.BRIGHTNESS, kwargs[ATTR_BRIGHTNESS])
-
+            changes[LightState.BRIGHTNESS] = kwargs[ATTR_BRIGHTNESS]
         if ATTR_HS_COLOR in kwargs:
-            await self.coordinator.async_update_state(LightState.HS_COLOR, kwargs[ATTR_HS_COLOR])
-
+            changes[LightState.HS_COLOR] = kwargs[ATTR_HS_COLOR]
         if ATTR_EFFECT in kwargs:
-            await self.coordinator.async_update_state(LightState.EFFECT, kwargs[ATTR_EFFECT])
+            changes[LightState.EFFECT] = kwargs[ATTR_EFFECT]
 
-    async def async_turn_off(self, **kwargs: Any) -> None:
-        await self.coordinator.async_update_state(LightState.POWER, False)
+        if kwargs.get(ATTR_TRANSITION):
+            await self.coordinator.async_fade(
+                {LightState.POWER: True, **changes}, kwargs[ATTR_TRANSITION]
+            )
+        elif changes:
+            await self.coordinator.async_update_states(changes)
 
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        if kwargs.get(ATTR_TRANSITION):
+            await self.coordinator.async_fade({LightState.POWER: False}, kwargs[ATTR_TRANSITION])
+            return
+        await self.coordinator.async_update_states({LightState.POWER: False})
@@ -0,0 +1,95 @@
+"""Low-overhead runtime counters for Fluora Light coordinators."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+# Bucket n counts samples of [2**(n-1), 2**n) microseconds; the last bucket is open-ended.
+HISTOGRAM_BUCKETS = 24
+
+
+class Histogram:
+    """Log2-bucketed latency histogram fed with nanosecond samples.
+
+    Recording is a couple of integer operations, cheap enough for every packet.
+    """
+
+    __slots__ = ("buckets", "count", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        self.buckets[min(HISTOGRAM_BUCKETS - 1, (elapsed_ns // 1000).bit_length())] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    @property
+    def mean_ms(self) -> float | None:
+        return self.total_ns / self.count / 1e6 if self.count else None
+
+    def percentile_ms(self, pct: float) -> float | None:
+        """Upper bound of the bucket holding the given percentile."""
+        if not self.count:
+            return None
+        target = self.count * pct
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return min(self.max_ns, (1 << bucket) * 1000) / 1e6
+        return self.max_ns / 1e6
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.mean_ms,
+            "p50_ms": self.percentile_ms(0.50),
+            "p99_ms": self.percentile_ms(0.99),
+            "max_ms": self.max_ns / 1e6,
+            "buckets_us": {
+                f"<{1 << bucket}": count for bucket, count in enumerate(self.buckets) if count
+            },
+        }
+
+
+@dataclass(slots=True)
+class CoordinatorMetrics:
+    """Counters kept by one LightCoordinator."""
+
+    packets: int = 0
+    bytes: int = 0
+    send_errors: int = 0
+    reinitializations: int = 0
+    # Keyed by raw OSC address; inner messages of a bundle count individually.
+    packets_by_route: Counter[bytes] = field(default_factory=Counter)
+    bytes_by_route: Counter[bytes] = field(default_factory=Counter)
+    # Time spent in the transport send call.
+    send_latency: Histogram = field(default_factory=Histogram)
+    # Time queued packets waited for the per-device send lock.
+    lock_wait: Histogram = field(default_factory=Histogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "packets": self.packets,
+            "bytes": self.bytes,
+            "send_errors": self.send_errors,
+            "reinitializations": self.reinitializations,
+            "packets_by_route": {
+                route.decode("ascii", "replace"): count
+                for route, count in self.packets_by_route.items()
+            },
+            "bytes_by_route": {
+                route.decode("ascii", "replace"): count
+                for route, count in self.bytes_by_route.items()
+            },
+            "send_latency": self.send_latency.as_dict(),
+            "lock_wait": self.lock_wait.as_dict(),
+        }
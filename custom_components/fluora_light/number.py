@@ -3,8 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from homeassistant.components.number import (
-    NumberEntity,
     NumberEntityDescription,
+    RestoreNumber,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -47,23 +47,30 @@ async def async_setup_entry(
 ) -> None:
     coordinator: LightCoordinator = hass.data[DOMAIN][config_entry.entry_id]
     async_add_entities(
-        [FluoraNumberEntity(coordinator, description) for description in NUMBER_DESCRIPTIONS],
-        update_before_add=True,
+        [FluoraNumberEntity(coordinator, description) for description in NUMBER_DESCRIPTIONS]
     )
 
 
-class FluoraNumberEntity(FluoraLightBaseEntity, NumberEntity):
+class FluoraNumberEntity(FluoraLightBaseEntity, RestoreNumber):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator: LightCoordinator, description: FluoraNumberEntityDescription) -> None:
-        super().__init__(coordinator, description)
+        super().__init__(coordinator, description, (description.state_key,))
         self.entity_description: FluoraNumberEntityDescription = description
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_number_data()
+        if last is not None and last.native_value is not None:
+            self.coordinator.async_restore_state(
+                {self.entity_description.state_key: last.native_value}
+            )
+
     @property
     def native_value(self) -> float | None:
         value = self.coordinator.state.get(self.entity_description.state_key)
         return float(value) if value is not None else None
 
     async def async_set_native_value(self, value: float) -> None:
-        await self.coordinator.async_update_state(self.entity_description.state_key, value)
+        await self.coordinator.async_update_states({self.entity_description.state_key: value})
 
@@ -0,0 +1,162 @@
+"""OSC encoding helpers for the Fluora protocol."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
+import struct
+from typing import Any
+
+OSC_BUNDLE_TAG = b"#bundle\x00"
+
+# Special OSC timetag meaning "process on receipt".
+OSC_TIMETAG_IMMEDIATE = 1
+
+# Seconds between the NTP epoch (1900) and the Unix epoch (1970).
+_NTP_EPOCH_OFFSET = 2208988800
+
+_TIMETAG = struct.Struct(">Q")
+_ELEMENT_SIZE = struct.Struct(">i")
+_ARG_CODECS = {"f": struct.Struct(">f"), "i": struct.Struct(">i")}
+
+
+def _pad4(b: bytes) -> bytes:
+    return b + (b"\x00" * ((4 - (len(b) % 4)) % 4))
+
+
+@lru_cache(maxsize=64)
+def osc_template(route: str, typetags: str) -> tuple[bytearray, struct.Struct, tuple[type, ...]]:
+    """Build a reusable buffer holding the encoded address/typetag prefix of a route."""
+    if not typetags.startswith(","):
+        raise ValueError("typetags must start with ',' (e.g. ',fi')")
+
+    converters: list[type] = []
+    for tag in typetags[1:]:
+        if tag == "f":
+            converters.append(float)
+        elif tag == "i":
+            converters.append(int)
+        else:
+            raise ValueError(f"Unsupported OSC tag: {tag!r}")
+
+    prefix = _pad4(route.encode("ascii") + b"\x00") + _pad4(typetags.encode("ascii") + b"\x00")
+    codec = struct.Struct(">" + typetags[1:])
+    buffer = bytearray(prefix) + bytearray(codec.size)
+    return buffer, codec, tuple(converters)
+
+
+def osc_message(route: str, typetags: str, args: list[Any]) -> bytes:
+    """Create an OSC-like payload.
+
+    The Fluora device speaks an OSC-style protocol: address string, type tags, then big-endian args.
+    The address/typetag prefix is encoded once per route; only the arguments are packed per call.
+    """
+    buffer, codec, converters = osc_template(route, typetags)
+    if len(converters) != len(args):
+        raise ValueError("typetags and args length mismatch")
+
+    codec.pack_into(
+        buffer,
+        len(buffer) - codec.size,
+        *(convert(arg) for convert, arg in zip(converters, args, strict=True)),
+    )
+    return bytes(buffer)
+
+
+def osc_timetag(unix_time: float | None = None) -> int:
+    """Return a 64-bit NTP timetag for a Unix timestamp, or "immediately" for None."""
+    if unix_time is None:
+        return OSC_TIMETAG_IMMEDIATE
+    seconds = int(unix_time)
+    fraction = int((unix_time - seconds) * (1 << 32)) & 0xFFFFFFFF
+    return ((seconds + _NTP_EPOCH_OFFSET) << 32) | fraction
+
+
+def osc_bundle(packets: Iterable[bytes], timetag: int = OSC_TIMETAG_IMMEDIATE) -> bytes:
+    """Wrap already-encoded OSC messages in a single #bundle datagram.
+
+    Elements of a bundle are dispatched in order, so a mode switch followed by palette
+    changes arrives as one atomic unit.
+    """
+    out = bytearray(OSC_BUNDLE_TAG)
+    out += _TIMETAG.pack(timetag)
+    for packet in packets:
+        out += _ELEMENT_SIZE.pack(len(packet))
+        out += packet
+    return bytes(out)
+
+
+def _read_string(data: bytes, offset: int) -> tuple[str, int]:
+    end = data.index(b"\x00", offset)
+    value = data[offset:end].decode("ascii")
+    # Strings are null terminated and padded to a multiple of 4 bytes.
+    return value, (end + 4) & ~3
+
+
+def osc_decode_message(data: bytes) -> tuple[str, tuple[Any, ...]]:
+    """Decode one OSC message into its address and arguments (mirror of osc_message)."""
+    try:
+        route, offset = _read_string(data, 0)
+        typetags, offset = _read_string(data, offset)
+    except (ValueError, UnicodeDecodeError) as err:
+        raise ValueError("Malformed OSC message") from err
+    if not route.startswith("/") or not typetags.startswith(","):
+        raise ValueError("Malformed OSC message")
+
+    args: list[Any] = []
+    for tag in typetags[1:]:
+        if (codec := _ARG_CODECS.get(tag)) is not None:
+            if offset + codec.size > len(data):
+                raise ValueError("Truncated OSC message")
+            args.append(codec.unpack_from(data, offset)[0])
+            offset += codec.size
+        elif tag == "s":
+            try:
+                value, offset = _read_string(data, offset)
+            except (ValueError, UnicodeDecodeError) as err:
+                raise ValueError("Malformed OSC string argument") from err
+            args.append(value)
+        else:
+            raise ValueError(f"Unsupported OSC tag: {tag!r}")
+    return route, tuple(args)
+
+
+def osc_decode(data: bytes) -> list[tuple[str, tuple[Any, ...]]]:
+    """Decode a datagram holding an OSC message or a (possibly nested) bundle."""
+    if not data.startswith(OSC_BUNDLE_TAG):
+        return [osc_decode_message(data)]
+
+    messages: list[tuple[str, tuple[Any, ...]]] = []
+    offset = len(OSC_BUNDLE_TAG) + _TIMETAG.size
+    while offset < len(data):
+        if offset + _ELEMENT_SIZE.size > len(data):
+            raise ValueError("Truncated OSC bundle")
+        (size,) = _ELEMENT_SIZE.unpack_from(data, offset)
+        offset += _ELEMENT_SIZE.size
+        if size <= 0 or offset + size > len(data):
+            raise ValueError("Truncated OSC bundle element")
+        messages.extend(osc_decode(data[offset : offset + size]))
+        offset += size
+    return messages
+
+
+def osc_route(packet: bytes) -> bytes:
+    """Return the raw address of an encoded OSC message without decoding it."""
+    return packet[: packet.index(b"\x00")]
+
+
+def osc_split(data: bytes) -> list[bytes]:
+    """Return the raw messages of a datagram, unwrapping (nested) bundles."""
+    if not data.startswith(OSC_BUNDLE_TAG):
+        return [data]
+
+    messages: list[bytes] = []
+    offset = len(OSC_BUNDLE_TAG) + _TIMETAG.size
+    while offset + _ELEMENT_SIZE.size <= len(data):
+        (size,) = _ELEMENT_SIZE.unpack_from(data, offset)
+        offset += _ELEMENT_SIZE.size
+        if size <= 0 or offset + size > len(data):
+            raise ValueError("Truncated OSC bundle element")
+        messages.extend(osc_split(data[offset : offset + size]))
+        offset += size
+    return messages
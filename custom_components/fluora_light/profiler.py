@@ -0,0 +1,220 @@
+"""On-demand profiling of the integration's own code paths.
+
+Nothing is hooked until a profile is requested. A sampling profile runs a thread
+that snapshots every thread's stack at a fixed interval and keeps the stacks that
+pass through this package, written as flamegraph-compatible collapsed stacks. A
+deterministic profile runs cProfile on the event loop thread and keeps the functions
+of this package and everything they call, written as pstats. Both report how long
+the event loop was blocked inside integration code, next to the send lock and
+pacing waits the coordinators recorded in the same window.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import cProfile
+from pathlib import Path
+import pstats
+import sys
+import threading
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from .const import DOMAIN, LOGGER
+from .coordinator import LightCoordinator
+
+DATA_PROFILE = "profile"
+
+PROFILE_SAMPLING = "sampling"
+PROFILE_DETERMINISTIC = "deterministic"
+PROFILE_MODES = [PROFILE_SAMPLING, PROFILE_DETERMINISTIC]
+
+DEFAULT_PROFILE_DURATION = 30
+MAX_PROFILE_DURATION = 600
+# Milliseconds between stack samples.
+DEFAULT_SAMPLE_INTERVAL = 5
+
+_PACKAGE_DIR = str(Path(__file__).resolve().parent)
+
+
+def _in_integration(filename: str) -> bool:
+    return filename.startswith(_PACKAGE_DIR)
+
+
+class _StackSampler(threading.Thread):
+    """Collapsed stacks of every thread that is running integration code."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name=f"{DOMAIN}_profiler", daemon=True)
+        self._interval = interval
+        self._stop_event = threading.Event()
+        # Created on the event loop thread.
+        self._loop_thread = threading.get_ident()
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        # Seconds between samples that found the event loop thread inside integration
+        # code; the sampler waits for the GIL, so gaps can be longer than the interval.
+        self.loop_blocked = 0.0
+        self.longest_block = 0.0
+
+    def run(self) -> None:
+        interval = self._interval
+        own = threading.get_ident()
+        block = 0.0
+        last = time.perf_counter()
+        while not self._stop_event.wait(interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            self.samples += 1
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            in_loop = False
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels: list[str] = []
+                hit = False
+                while frame is not None:
+                    code = frame.f_code
+                    hit = hit or _in_integration(code.co_filename)
+                    labels.append(
+                        f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                if not hit:
+                    continue
+                labels.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(labels))] += 1
+                in_loop = in_loop or ident == self._loop_thread
+            if in_loop:
+                self.loop_blocked += elapsed
+                block += elapsed
+                self.longest_block = max(self.longest_block, block)
+            else:
+                block = 0.0
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _restrict_stats(stats: pstats.Stats) -> float:
+    """Keep functions of this package and everything they call.
+
+    Returns the seconds spent in integration entry points (functions no other
+    integration function called) including their callees, i.e. loop blocking time.
+    """
+    raw: dict[Any, Any] = stats.stats  # type: ignore[attr-defined]
+    kept = {func for func in raw if _in_integration(func[0])}
+    grown = True
+    while grown:
+        grown = False
+        for func, (_, _, _, _, callers) in raw.items():
+            if func not in kept and any(caller in kept for caller in callers):
+                kept.add(func)
+                grown = True
+
+    blocking = 0.0
+    restricted: dict[Any, Any] = {}
+    for func in kept:
+        cc, nc, tt, ct, callers = raw[func]
+        if _in_integration(func[0]) and not any(_in_integration(caller[0]) for caller in callers):
+            blocking += ct
+        restricted[func] = (
+            cc,
+            nc,
+            tt,
+            ct,
+            {caller: value for caller, value in callers.items() if caller in kept},
+        )
+    stats.stats = restricted  # type: ignore[attr-defined]
+    stats.total_tt = sum(value[2] for value in restricted.values())  # type: ignore[attr-defined]
+    return blocking
+
+
+def _write_collapsed(path: Path, stacks: Counter[str]) -> None:
+    with path.open("w", encoding="utf-8") as file:
+        for stack, count in stacks.most_common():
+            file.write(f"{stack} {count}\n")
+
+
+def _wait_totals(coordinators: list[LightCoordinator]) -> tuple[int, float]:
+    """Send lock wait (ns) and pacing sleep (s) recorded so far across all lights."""
+    return (
+        sum(coordinator.metrics.lock_wait.total_ns for coordinator in coordinators),
+        sum(coordinator.send_queue.paced_seconds for coordinator in coordinators),
+    )
+
+
+async def async_profile(
+    hass: HomeAssistant,
+    mode: str = PROFILE_SAMPLING,
+    duration: float = DEFAULT_PROFILE_DURATION,
+    interval: float = DEFAULT_SAMPLE_INTERVAL,
+) -> dict[str, Any]:
+    """Profile for duration seconds, write the report to the config directory and summarize it.
+
+    interval is the sampling period in milliseconds. Only one profile runs at a time.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(DATA_PROFILE):
+        raise ServiceValidationError("A Fluora profile is already running")
+    domain_data[DATA_PROFILE] = True
+
+    coordinators = [
+        coordinator
+        for coordinator in domain_data.values()
+        if isinstance(coordinator, LightCoordinator)
+    ]
+    lock_wait_before, paced_before = _wait_totals(coordinators)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    summary: dict[str, Any] = {"mode": mode, "duration": duration}
+    try:
+        if mode == PROFILE_DETERMINISTIC:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as err:
+                # Another profiler, such as Home Assistant's own, is running.
+                raise ServiceValidationError(str(err)) from err
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                profiler.disable()
+            stats = pstats.Stats(profiler)
+            summary["loop_blocked_ms"] = round(_restrict_stats(stats) * 1000, 3)
+            path = Path(hass.config.path(f"{DOMAIN}_profile_{stamp}.pstats"))
+            await hass.async_add_executor_job(stats.dump_stats, path)
+        else:
+            sampler = _StackSampler(interval / 1000)
+            # The sampler only runs when the loop thread releases the GIL; make it do so
+            # at least once per sample, or short callbacks would never be caught.
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(switch_interval, interval / 1000))
+            sampler.start()
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                await hass.async_add_executor_job(sampler.stop)
+                sys.setswitchinterval(switch_interval)
+            summary.update(
+                samples=sampler.samples,
+                loop_blocked_ms=round(sampler.loop_blocked * 1000, 3),
+                longest_block_ms=round(sampler.longest_block * 1000, 3),
+            )
+            path = Path(hass.config.path(f"{DOMAIN}_profile_{stamp}.collapsed"))
+            await hass.async_add_executor_job(_write_collapsed, path, sampler.stacks)
+    finally:
+        domain_data.pop(DATA_PROFILE, None)
+
+    lock_wait_after, paced_after = _wait_totals(coordinators)
+    summary.update(
+        lock_wait_ms=round((lock_wait_after - lock_wait_before) / 1e6, 3),
+        paced_ms=round((paced_after - paced_before) * 1000, 3),
+        path=str(path),
+    )
+    LOGGER.info("Fluora profile written to %s: %s", path, summary)
+    return summary
@@ -0,0 +1,135 @@
+"""Shared hostname resolution for Fluora lights."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import ipaddress
+import socket
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, LOGGER
+
+DATA_RESOLVER = "resolver"
+
+# getaddrinfo does not expose record TTLs; DHCP leases move far slower than this.
+RESOLVE_TTL = 300.0
+# Re-resolve tracked hosts in the background this long before the entry expires.
+REFRESH_MARGIN = 30.0
+
+
+@dataclass(slots=True)
+class _HostEntry:
+    address: str | None = None
+    expires: float = 0.0
+    listeners: list[Callable[[str], None]] = field(default_factory=list)
+    refresh_unsub: CALLBACK_TYPE | None = None
+
+
+class FluoraResolver:
+    """Async resolver with a TTL cache shared by all coordinators.
+
+    Concurrent lookups for the same hostname share one getaddrinfo call, and hosts
+    with listeners are re-resolved in the background before their entry expires.
+    """
+
+    def __init__(self, hass: HomeAssistant, ttl: float = RESOLVE_TTL) -> None:
+        self._hass = hass
+        self._ttl = ttl
+        self._hosts: dict[str, _HostEntry] = {}
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+
+    async def async_resolve(self, hostname: str, *, force: bool = False) -> str:
+        """Return the IPv4 address for a hostname, from cache unless expired or forced."""
+        entry = self._hosts.get(hostname)
+        if (
+            not force
+            and entry is not None
+            and entry.address is not None
+            and self._hass.loop.time() < entry.expires
+        ):
+            return entry.address
+
+        if (task := self._inflight.get(hostname)) is None:
+            task = self._hass.async_create_task(
+                self._async_lookup(hostname), f"fluora_light resolve {hostname}"
+            )
+            self._inflight[hostname] = task
+            task.add_done_callback(lambda _: self._inflight.pop(hostname, None))
+        return await asyncio.shield(task)
+
+    async def _async_lookup(self, hostname: str) -> str:
+        infos = await self._hass.loop.getaddrinfo(
+            hostname, None, family=socket.AF_INET, type=socket.SOCK_DGRAM
+        )
+        address = infos[0][4][0]
+
+        entry = self._hosts.setdefault(hostname, _HostEntry())
+        previous = entry.address
+        entry.address = address
+        entry.expires = self._hass.loop.time() + self._ttl
+
+        if previous is not None and previous != address:
+            LOGGER.info("Fluora light %s moved from %s to %s", hostname, previous, address)
+            for listener in list(entry.listeners):
+                listener(address)
+        return address
+
+    @callback
+    def async_track(self, hostname: str, on_change: Callable[[str], None]) -> CALLBACK_TYPE:
+        """Keep a hostname fresh in the background and report address changes."""
+        entry = self._hosts.setdefault(hostname, _HostEntry())
+        entry.listeners.append(on_change)
+        if entry.refresh_unsub is None and not _is_ip_address(hostname):
+            self._async_schedule_refresh(hostname, entry)
+
+        @callback
+        def _async_untrack() -> None:
+            entry.listeners.remove(on_change)
+            if not entry.listeners and entry.refresh_unsub is not None:
+                entry.refresh_unsub()
+                entry.refresh_unsub = None
+
+        return _async_untrack
+
+    @callback
+    def _async_schedule_refresh(self, hostname: str, entry: _HostEntry) -> None:
+        delay = max(REFRESH_MARGIN, entry.expires - self._hass.loop.time() - REFRESH_MARGIN)
+
+        @callback
+        def _async_refresh(_now) -> None:
+            entry.refresh_unsub = None
+            self._hass.async_create_background_task(
+                self._async_refresh(hostname, entry), f"fluora_light refresh {hostname}"
+            )
+
+        entry.refresh_unsub = async_call_later(self._hass, delay, _async_refresh)
+
+    async def _async_refresh(self, hostname: str, entry: _HostEntry) -> None:
+        try:
+            await self.async_resolve(hostname, force=True)
+        except OSError as err:
+            # Keep the last known address; the next send error forces another attempt.
+            LOGGER.debug("Background resolve of %s failed: %s", hostname, err)
+        if entry.listeners:
+            self._async_schedule_refresh(hostname, entry)
+
+
+def _is_ip_address(hostname: str) -> bool:
+    try:
+        ipaddress.ip_address(hostname)
+    except ValueError:
+        return False
+    return True
+
+
+@callback
+def async_get_resolver(hass: HomeAssistant) -> FluoraResolver:
+    """Return the integration-wide resolver, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (resolver := domain_data.get(DATA_RESOLVER)) is None:
+        resolver = domain_data[DATA_RESOLVER] = FluoraResolver(hass)
+    return resolver
@@ -0,0 +1,210 @@
+"""Declarative registry of Fluora device routes with precompiled codecs.
+
+Every known route is described once by a RouteSpec. At import time each spec gets a
+RouteCodec: the padded address/typetag prefix is encoded once and the arguments are
+packed with a precompiled struct.Struct, so encoding a value is one transform, one
+clamp and one pack. Adding a route from a device config dump only takes a new
+RouteSpec in ROUTE_SPECS.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass
+import struct
+from typing import Any
+
+from .const import (
+    BRIGHTNESS_ROUTE,
+    DEVICE_MODE_AUTO,
+    DEVICE_MODE_MANUAL,
+    DEVICE_MODE_SCENE,
+    EFFECT_AUTO,
+    EFFECT_BLUE,
+    EFFECT_GREEN,
+    EFFECT_ORANGE,
+    EFFECT_PURPLE,
+    EFFECT_RED,
+    EFFECT_YELLOW,
+    HUE_ROUTE,
+    MANUAL_SIZE_ROUTE,
+    MANUAL_SPEED_ROUTE,
+    MODE_ROUTE,
+    POWER_ROUTE,
+    SATURATION_MAX,
+    SATURATION_MIN,
+    SATURATION_ROUTE,
+    SCENE_EFFECTS,
+    SCENE_ROUTE,
+    calculate_brightness_hex,
+    hue_from_device,
+    hue_to_device,
+    saturation_from_device,
+    saturation_to_device,
+)
+from .osc import osc_template
+
+ROUTE_POWER = "power"
+ROUTE_MODE = "mode"
+ROUTE_SCENE = "scene"
+ROUTE_BRIGHTNESS = "brightness"
+ROUTE_HUE = "hue"
+ROUTE_SATURATION = "saturation"
+ROUTE_SPEED = "speed"
+ROUTE_SIZE = "size"
+
+_FLOAT32 = struct.Struct(">f")
+
+
+def brightness_to_device(value: int) -> float:
+    """Device brightness float for an HA 0-255 brightness.
+
+    The curve yields the top 24 bits of the float32; the low byte is always zero.
+    """
+    bits = int(calculate_brightness_hex(round(int(value) * 100 / 255))) << 8
+    return _FLOAT32.unpack(bits.to_bytes(4, "big"))[0]
+
+
+# Device brightness float for each HA brightness, used to map read-back to HA values.
+BRIGHTNESS_LEVELS: tuple[float, ...] = tuple(brightness_to_device(value) for value in range(256))
+
+
+def brightness_from_device(level: float) -> int:
+    """Return the HA brightness whose device level is nearest to a read-back level."""
+    index = bisect_left(BRIGHTNESS_LEVELS, level)
+    if index == len(BRIGHTNESS_LEVELS):
+        return 255
+    if index and level - BRIGHTNESS_LEVELS[index - 1] < BRIGHTNESS_LEVELS[index] - level:
+        return index - 1
+    return index
+
+
+# Name -> (HA value to device value, device value to HA value).
+TRANSFORMS: dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    "switch": (lambda value: 1 if value else 0, bool),
+    "brightness": (brightness_to_device, brightness_from_device),
+    "hue": (hue_to_device, hue_from_device),
+    "saturation": (saturation_to_device, saturation_from_device),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RouteSpec:
+    """One device route as listed in a device config dump.
+
+    The first argument carries the value and any further arguments are sent as zero.
+    minimum and maximum clamp the value in HA units, before the named transform
+    turns it into device units.
+    """
+
+    key: str
+    address: str
+    typetags: str = ",fi"
+    minimum: float | None = None
+    maximum: float | None = None
+    transform: str | None = None
+
+
+ROUTE_SPECS: tuple[RouteSpec, ...] = (
+    RouteSpec(ROUTE_POWER, POWER_ROUTE, ",ii", 0, 1, "switch"),
+    RouteSpec(ROUTE_MODE, MODE_ROUTE, ",ii", DEVICE_MODE_AUTO, DEVICE_MODE_MANUAL),
+    RouteSpec(ROUTE_SCENE, SCENE_ROUTE, ",ii", 0, len(SCENE_EFFECTS) - 1),
+    RouteSpec(ROUTE_BRIGHTNESS, BRIGHTNESS_ROUTE, ",fi", 0, 255, "brightness"),
+    # Hue wraps around the wheel inside the transform instead of being clamped.
+    RouteSpec(ROUTE_HUE, HUE_ROUTE, ",fi", transform="hue"),
+    RouteSpec(ROUTE_SATURATION, SATURATION_ROUTE, ",fi", 0, 100, "saturation"),
+    RouteSpec(ROUTE_SPEED, MANUAL_SPEED_ROUTE, ",fi", 0.0, 1.0),
+    RouteSpec(ROUTE_SIZE, MANUAL_SIZE_ROUTE, ",fi", 0.0, 1.0),
+)
+
+
+class RouteCodec:
+    """Encoder and decoder for one route, built once from its RouteSpec."""
+
+    __slots__ = ("spec", "address", "prefix", "encode", "encode_device", "from_device", "_value")
+
+    def __init__(self, spec: RouteSpec) -> None:
+        buffer, codec, converters = osc_template(spec.address, spec.typetags)
+        prefix = bytes(buffer[: len(buffer) - codec.size])
+        pack = codec.pack
+        convert = converters[0]
+        padding = (0,) * (len(converters) - 1)
+        to_device, from_device = TRANSFORMS[spec.transform] if spec.transform else (None, None)
+        minimum, maximum = spec.minimum, spec.maximum
+
+        def encode_device(value: Any) -> bytes:
+            """Encode a value already in device units."""
+            return prefix + pack(convert(value), *padding)
+
+        def encode(value: Any) -> bytes:
+            """Clamp and transform an HA value, then encode it."""
+            if minimum is not None and value < minimum:
+                value = minimum
+            elif maximum is not None and value > maximum:
+                value = maximum
+            if to_device is not None:
+                value = to_device(value)
+            return prefix + pack(convert(value), *padding)
+
+        self.spec = spec
+        self.address = spec.address.encode("ascii")
+        self.prefix = prefix
+        self.encode: Callable[[Any], bytes] = encode
+        self.encode_device: Callable[[Any], bytes] = encode_device
+        self.from_device: Callable[[Any], Any] = from_device or (lambda value: value)
+        self._value = struct.Struct(">" + spec.typetags[1])
+
+    def decode_device(self, packet: bytes) -> Any:
+        """Return the value of an encoded message in device units."""
+        prefix = self.prefix
+        if not packet.startswith(prefix) or len(packet) < len(prefix) + self._value.size:
+            raise ValueError(f"Not a {self.spec.key} message")
+        return self._value.unpack_from(packet, len(prefix))[0]
+
+    def decode(self, packet: bytes) -> Any:
+        """Return the value of an encoded message in HA units."""
+        return self.from_device(self.decode_device(packet))
+
+
+ROUTES: dict[str, RouteCodec] = {spec.key: RouteCodec(spec) for spec in ROUTE_SPECS}
+ROUTES_BY_ADDRESS: dict[bytes, RouteCodec] = {codec.address: codec for codec in ROUTES.values()}
+
+_POWER = ROUTES[ROUTE_POWER]
+_MODE = ROUTES[ROUTE_MODE]
+_SCENE = ROUTES[ROUTE_SCENE]
+_HUE = ROUTES[ROUTE_HUE]
+_SATURATION = ROUTES[ROUTE_SATURATION]
+
+# Device hue of each color preset.
+COLOR_PRESET_HUES: dict[str, float] = {
+    EFFECT_RED: 0.842010498046875,
+    EFFECT_ORANGE: 0.8527679443359375,
+    EFFECT_GREEN: 0.22816085815429688,
+    EFFECT_BLUE: 0.4677734375,
+    EFFECT_PURPLE: 0.71563720703125,
+    EFFECT_YELLOW: 2.0772567950189114e-06,
+}
+
+# Ready-to-send payloads, encoded once at import time.
+POWER_ON_PACKET = _POWER.encode(True)
+POWER_OFF_PACKET = _POWER.encode(False)
+
+AUTO_PACKET = _MODE.encode(DEVICE_MODE_AUTO)
+SCENE_PACKET = _MODE.encode(DEVICE_MODE_SCENE)
+MANUAL_PACKET = _MODE.encode(DEVICE_MODE_MANUAL)
+
+MIN_SATURATION_PACKET = _SATURATION.encode_device(SATURATION_MIN)
+MAX_SATURATION_PACKET = _SATURATION.encode_device(SATURATION_MAX)
+
+# Packet selecting each effect: the scene index, the preset hue for colors, or auto mode.
+SCENE_PACKET_DICT: dict[str, bytes] = {
+    **{effect: _SCENE.encode(index) for index, effect in enumerate(SCENE_EFFECTS)},
+    EFFECT_AUTO: AUTO_PACKET,
+    **{effect: _HUE.encode_device(hue) for effect, hue in COLOR_PRESET_HUES.items()},
+}
+
+# Brightness packets indexed by the HA 0-255 brightness value.
+BRIGHTNESS_PACKETS: tuple[bytes, ...] = tuple(
+    ROUTES[ROUTE_BRIGHTNESS].encode(value) for value in range(256)
+)
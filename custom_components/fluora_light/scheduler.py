@@ -0,0 +1,222 @@
+"""Outgoing command scheduling for Fluora Light."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import LOGGER
+
+# Adaptive pacing bounds: the gap backs off on loss and creeps back to the configured floor.
+GAP_BACKOFF_FACTOR = 1.5
+GAP_RECOVERY_FACTOR = 0.95
+MAX_PACKET_GAP = 0.5
+
+# Lower runs first. An urgent entry also skips the pacing wait.
+PRIORITY_URGENT = 0
+PRIORITY_POWER = 1
+PRIORITY_COLOR = 2
+PRIORITY_TUNING = 3
+
+
+class TokenBucket:
+    """Token bucket on the event loop clock.
+
+    With a capacity of one token this enforces a minimum gap between packets.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated: float | None = None
+
+    def _refill(self, now: float) -> None:
+        if self._updated is not None and self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        elif self.rate <= 0:
+            self._tokens = self.capacity
+        self._updated = now
+
+    def delay(self, now: float) -> float:
+        """Return seconds until a token is available."""
+        self._refill(now)
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    def consume(self, now: float) -> None:
+        self._refill(now)
+        self._tokens -= 1.0
+
+
+class CoalescingSendQueue:
+    """Per-device paced, prioritized send queue where a newer command replaces a pending one.
+
+    Each entry is keyed by route and holds one or more packets that are sent in order.
+    Slider-driven controls produce a stream of intermediate values; only the latest
+    value per route is kept. An optional prepare callback turns an entry into the
+    packets actually sent when it is dequeued. Every packet takes a token from the
+    pacing bucket.
+
+    The entry with the lowest priority value is sent next. Between packets of a
+    sequence the queue checks for preemption: a newer entry for the same key cancels
+    the rest of the sequence, and a higher-priority entry runs first while the rest
+    of the sequence is put back.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        send: Callable[[bytes], Awaitable[None]],
+        packet_gap: float,
+        adaptive: bool = True,
+        prepare: Callable[[tuple[bytes, ...]], tuple[bytes, ...]] | None = None,
+    ) -> None:
+        self._hass = hass
+        self._name = name
+        self._send = send
+        self._prepare = prepare
+        self._pending: dict[str, tuple[int, tuple[bytes, ...]]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup = asyncio.Event()
+
+        self._min_gap = packet_gap
+        self._adaptive = adaptive
+        self._bucket = TokenBucket(1.0 / packet_gap if packet_gap > 0 else 0.0)
+
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.preempted = 0
+        # Seconds spent waiting for pacing tokens.
+        self.paced_seconds = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def packet_gap(self) -> float:
+        """Current inter-packet gap in seconds."""
+        return 1.0 / self._bucket.rate if self._bucket.rate > 0 else 0.0
+
+    def _set_gap(self, gap: float) -> None:
+        gap = max(self._min_gap, min(MAX_PACKET_GAP, gap))
+        self._bucket.rate = 1.0 / gap if gap > 0 else 0.0
+
+    @callback
+    def async_report_loss(self) -> None:
+        """Back off after the device or network signalled a lost packet."""
+        if self._adaptive:
+            self._set_gap(max(self.packet_gap, 0.01) * GAP_BACKOFF_FACTOR)
+
+    @callback
+    def async_report_delivered(self) -> None:
+        """Creep back towards the configured gap after a clean delivery."""
+        if self._adaptive and self.packet_gap > self._min_gap:
+            self._set_gap(self.packet_gap * GAP_RECOVERY_FACTOR)
+
+    @callback
+    def async_enqueue(self, key: str, *packets: bytes, priority: int = PRIORITY_COLOR) -> None:
+        """Queue packets for a route, replacing any pending packets for the same route."""
+        if key in self._pending:
+            # The key keeps its original position so cross-route ordering is preserved.
+            self.coalesced += 1
+        self._pending[key] = (priority, packets)
+        if priority == PRIORITY_URGENT:
+            self._wakeup.set()
+
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_drain(), f"{self._name} send queue"
+            )
+
+    @callback
+    def async_discard(self, *keys: str) -> None:
+        """Drop pending packets that a newer command supersedes."""
+        for key in keys:
+            if self._pending.pop(key, None) is not None:
+                self.dropped += 1
+
+    async def async_join(self) -> None:
+        """Wait until everything queued so far has been sent."""
+        while (task := self._task) is not None:
+            await asyncio.shield(task)
+
+    def _preempt(
+        self, key: str, priority: int, remainder: tuple[bytes, ...], started: bool
+    ) -> bool:
+        """Cancel or put back the rest of a sequence if a newer entry takes precedence."""
+        if key in self._pending:
+            # A newer sequence for the same route supersedes what is left of this one.
+            if started:
+                self.preempted += 1
+            else:
+                self.coalesced += 1
+            return True
+        if any(pending[0] < priority for pending in self._pending.values()):
+            if started:
+                self.preempted += 1
+            self._pending[key] = (priority, remainder)
+            return True
+        return False
+
+    async def _async_ready(
+        self, key: str, priority: int, remainder: tuple[bytes, ...], started: bool
+    ) -> bool:
+        """Wait for a pacing token; return False if the rest of the sequence was preempted."""
+        loop = self._hass.loop
+        while True:
+            # Newer values arriving during the wait coalesce into the pending entries.
+            if self._preempt(key, priority, remainder, started):
+                return False
+            if priority == PRIORITY_URGENT or (delay := self._bucket.delay(loop.time())) <= 0:
+                return True
+            self._wakeup.clear()
+            wait_start = loop.time()
+            with suppress(TimeoutError):
+                async with asyncio.timeout(delay):
+                    # An urgent entry cuts the wait short.
+                    await self._wakeup.wait()
+            self.paced_seconds += loop.time() - wait_start
+
+    async def _async_drain(self) -> None:
+        loop = self._hass.loop
+        pending = self._pending
+        try:
+            while pending:
+                # min() keeps insertion order among entries of equal priority.
+                key = min(pending, key=lambda pending_key: pending[pending_key][0])
+                priority, packets = pending.pop(key)
+                if self._prepare is not None:
+                    # Everything popped earlier has been sent, so the device view is current.
+                    packets = self._prepare(packets)
+                for index, packet in enumerate(packets):
+                    if not await self._async_ready(key, priority, packets[index:], index > 0):
+                        break
+                    self._bucket.consume(loop.time())
+                    try:
+                        await self._send(packet)
+                    except UpdateFailed as err:
+                        self.dropped += 1
+                        LOGGER.debug("%s: dropping queued %s packet: %s", self._name, key, err)
+                        break
+                    self.sent += 1
+        finally:
+            self._task = None
+
+    async def async_close(self) -> None:
+        self.dropped += len(self._pending)
+        self._pending.clear()
+
+        task = self._task
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
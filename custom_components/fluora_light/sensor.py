@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .const import DOMAIN
+from .coordinator import LightCoordinator
+from .entity import FluoraLightBaseEntity
+
+# Metrics change with every packet without notifying listeners, so sample them instead.
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class FluoraSensorEntityDescription(SensorEntityDescription):
+    value_fn: Callable[[LightCoordinator], StateType]
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+SENSOR_DESCRIPTIONS: tuple[FluoraSensorEntityDescription, ...] = (
+    FluoraSensorEntityDescription(
+        key="packets_sent",
+        name="Packets sent",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.metrics.packets,
+    ),
+    FluoraSensorEntityDescription(
+        key="bytes_sent",
+        name="Bytes sent",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.metrics.bytes,
+    ),
+    FluoraSensorEntityDescription(
+        key="send_latency_p99",
+        name="Send latency (p99)",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda coordinator: coordinator.metrics.send_latency.percentile_ms(0.99),
+    ),
+    FluoraSensorEntityDescription(
+        key="lock_wait_p99",
+        name="Send lock wait (p99)",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        value_fn=lambda coordinator: coordinator.metrics.lock_wait.percentile_ms(0.99),
+    ),
+    FluoraSensorEntityDescription(
+        key="pacing_wait",
+        name="Pacing wait",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=1,
+        value_fn=lambda coordinator: coordinator.send_queue.paced_seconds,
+    ),
+    FluoraSensorEntityDescription(
+        key="queue_depth",
+        name="Send queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.send_queue.depth,
+    ),
+    FluoraSensorEntityDescription(
+        key="coalesced_commands",
+        name="Coalesced commands",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.send_queue.coalesced,
+    ),
+    FluoraSensorEntityDescription(
+        key="preempted_sequences",
+        name="Preempted sequences",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.send_queue.preempted,
+    ),
+    FluoraSensorEntityDescription(
+        key="skipped_packets",
+        name="Skipped packets",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.skipped_packets,
+    ),
+    FluoraSensorEntityDescription(
+        key="packet_loss",
+        name="Estimated packet loss",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda coordinator: (
+            coordinator.delivery.loss_rate * 100
+            if coordinator.delivery.loss_rate is not None
+            else None
+        ),
+    ),
+    FluoraSensorEntityDescription(
+        key="redundant_sends",
+        name="Redundant sends",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.delivery.resent,
+    ),
+    FluoraSensorEntityDescription(
+        key="send_errors",
+        name="Send errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.metrics.send_errors,
+    ),
+    FluoraSensorEntityDescription(
+        key="reinitializations",
+        name="Reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.metrics.reinitializations,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator: LightCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(
+        FluoraSensorEntity(coordinator, description) for description in SENSOR_DESCRIPTIONS
+    )
+
+
+class FluoraSensorEntity(FluoraLightBaseEntity, SensorEntity):
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: LightCoordinator, description: FluoraSensorEntityDescription) -> None:
+        super().__init__(coordinator, description)
+        self.entity_description: FluoraSensorEntityDescription = description
+
+    @property
+    def should_poll(self) -> bool:
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        return self.entity_description.value_fn(self.coordinator)
+
+    async def async_update(self) -> None:
+        """Metrics are read directly from the coordinator; there is nothing to fetch."""
@@ -0,0 +1,277 @@
+"""Services for the Fluora Light integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Hashable
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.light import ATTR_BRIGHTNESS, ATTR_EFFECT, ATTR_HS_COLOR
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .const import DOMAIN, EFFECT_CUSTOM, EFFECT_LIST
+from .coordinator import LightCoordinator, LightState
+from .group import async_send_group
+from .profiler import (
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_SAMPLE_INTERVAL,
+    MAX_PROFILE_DURATION,
+    PROFILE_MODES,
+    PROFILE_SAMPLING,
+    async_profile,
+)
+from .snapshot import async_get_snapshots
+from .timeline import (
+    CHANNEL_BRIGHTNESS,
+    CHANNEL_HUE,
+    CHANNEL_SATURATION,
+    CHANNEL_SIZE,
+    CHANNEL_SPEED,
+    CHANNELS,
+    EASING_LINEAR,
+    EASINGS,
+    Keyframe,
+)
+
+SERVICE_GROUP_COMMAND = "group_command"
+SERVICE_RESYNC = "resync"
+SERVICE_PLAY_TIMELINE = "play_timeline"
+SERVICE_PAUSE_TIMELINE = "pause_timeline"
+SERVICE_RESUME_TIMELINE = "resume_timeline"
+SERVICE_STOP_TIMELINE = "stop_timeline"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+SERVICE_DELETE_SNAPSHOT = "delete_snapshot"
+SERVICE_PROFILE = "profile"
+
+ATTR_POWER = "power"
+ATTR_SPEED = "speed"
+ATTR_SIZE = "size"
+ATTR_KEYFRAMES = "keyframes"
+ATTR_AT = "at"
+ATTR_EASING = "easing"
+ATTR_FPS = "fps"
+ATTR_LOOP = "loop"
+ATTR_NAME = "name"
+ATTR_MODE = "mode"
+ATTR_DURATION = "duration"
+ATTR_INTERVAL = "interval"
+
+_UNIT_FLOAT = vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0))
+
+GROUP_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_POWER): cv.boolean,
+        vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional(ATTR_HS_COLOR): vol.All(
+            vol.ExactSequence(
+                (
+                    vol.All(vol.Coerce(float), vol.Range(min=0, max=360)),
+                    vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                )
+            ),
+            vol.Coerce(tuple),
+        ),
+        # Custom only names a color set through hs_color; it has no packet of its own.
+        vol.Optional(ATTR_EFFECT): vol.In(
+            [effect for effect in EFFECT_LIST if effect != EFFECT_CUSTOM]
+        ),
+        vol.Optional(ATTR_SPEED): _UNIT_FLOAT,
+        vol.Optional(ATTR_SIZE): _UNIT_FLOAT,
+    }
+)
+
+ENTITY_IDS_SCHEMA = vol.Schema({vol.Required(ATTR_ENTITY_ID): cv.entity_ids})
+
+KEYFRAME_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_AT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(CHANNEL_HUE): vol.All(vol.Coerce(float), vol.Range(min=0, max=360)),
+            vol.Optional(CHANNEL_SATURATION): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=100)
+            ),
+            vol.Optional(CHANNEL_BRIGHTNESS): vol.All(vol.Coerce(float), vol.Range(min=0, max=255)),
+            vol.Optional(CHANNEL_SPEED): _UNIT_FLOAT,
+            vol.Optional(CHANNEL_SIZE): _UNIT_FLOAT,
+            vol.Optional(ATTR_EASING, default=EASING_LINEAR): vol.In(EASINGS),
+        }
+    ),
+    cv.has_at_least_one_key(*CHANNELS),
+)
+
+PLAY_TIMELINE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_KEYFRAMES): vol.All(cv.ensure_list, [KEYFRAME_SCHEMA], vol.Length(min=2)),
+        vol.Optional(ATTR_FPS): vol.All(vol.Coerce(float), vol.Range(min=1, max=50)),
+        vol.Optional(ATTR_LOOP, default=False): cv.boolean,
+    }
+)
+
+SNAPSHOT_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_ENTITY_ID): cv.entity_ids, vol.Required(ATTR_NAME): cv.string}
+)
+
+RESTORE_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_ENTITY_ID): cv.entity_ids, vol.Required(ATTR_NAME): cv.string}
+)
+
+DELETE_SNAPSHOT_SCHEMA = vol.Schema({vol.Required(ATTR_NAME): cv.string})
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_MODE, default=PROFILE_SAMPLING): vol.In(PROFILE_MODES),
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        ),
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_SAMPLE_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+_SERVICE_STATE_KEYS: dict[str, LightState] = {
+    ATTR_POWER: LightState.POWER,
+    ATTR_BRIGHTNESS: LightState.BRIGHTNESS,
+    ATTR_HS_COLOR: LightState.HS_COLOR,
+    ATTR_EFFECT: LightState.EFFECT,
+    ATTR_SPEED: LightState.SPEED,
+    ATTR_SIZE: LightState.SIZE,
+}
+
+
+def async_get_coordinators(hass: HomeAssistant, entity_ids: list[str]) -> list[LightCoordinator]:
+    """Resolve entity ids of this integration to their (deduplicated) coordinators."""
+    registry = er.async_get(hass)
+    coordinators: dict[str, LightCoordinator] = {}
+    for entity_id in entity_ids:
+        entry = registry.async_get(entity_id)
+        if entry is None or entry.platform != DOMAIN or entry.config_entry_id is None:
+            raise ServiceValidationError(f"{entity_id} is not a Fluora Light entity")
+        coordinator = hass.data.get(DOMAIN, {}).get(entry.config_entry_id)
+        if coordinator is None:
+            raise ServiceValidationError(f"{entity_id} is not loaded")
+        coordinators[entry.config_entry_id] = coordinator
+    return list(coordinators.values())
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration-level services."""
+
+    async def _async_group_command(call: ServiceCall) -> None:
+        coordinators = async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+        changes: dict[LightState, Any] = {
+            state_key: call.data[attr]
+            for attr, state_key in _SERVICE_STATE_KEYS.items()
+            if attr in call.data
+        }
+        await async_send_group(coordinators, changes)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_GROUP_COMMAND, _async_group_command, schema=GROUP_COMMAND_SCHEMA
+    )
+
+    async def _async_resync(call: ServiceCall) -> None:
+        for coordinator in async_get_coordinators(hass, call.data[ATTR_ENTITY_ID]):
+            await coordinator.async_resync()
+
+    hass.services.async_register(DOMAIN, SERVICE_RESYNC, _async_resync, schema=ENTITY_IDS_SCHEMA)
+
+    async def _async_play_timeline(call: ServiceCall) -> None:
+        coordinators = async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+        keyframes = [
+            Keyframe(
+                at=keyframe[ATTR_AT],
+                values={channel: keyframe[channel] for channel in CHANNELS if channel in keyframe},
+                easing=keyframe[ATTR_EASING],
+            )
+            for keyframe in call.data[ATTR_KEYFRAMES]
+        ]
+        fps, loop = call.data.get(ATTR_FPS), call.data[ATTR_LOOP]
+        # Compile once per distinct key, off the event loop, and share the frames.
+        keys = {
+            coordinator: coordinator.timeline_key(keyframes, fps) for coordinator in coordinators
+        }
+        builders: dict[Hashable, LightCoordinator] = {}
+        for coordinator, key in keys.items():
+            builders.setdefault(key, coordinator)
+        try:
+            compiled = await asyncio.gather(
+                *(
+                    builder.async_compile_timeline(keyframes, fps=fps, loop=loop)
+                    for builder in builders.values()
+                )
+            )
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        frames = dict(zip(builders, compiled, strict=True))
+        await asyncio.gather(
+            *(
+                coordinator.async_play_timeline(keyframes, fps=fps, loop=loop, frames=frames[key])
+                for coordinator, key in keys.items()
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PLAY_TIMELINE, _async_play_timeline, schema=PLAY_TIMELINE_SCHEMA
+    )
+
+    async def _async_control_timeline(call: ServiceCall) -> None:
+        for coordinator in async_get_coordinators(hass, call.data[ATTR_ENTITY_ID]):
+            if call.service == SERVICE_PAUSE_TIMELINE:
+                coordinator.async_pause_timeline()
+            elif call.service == SERVICE_RESUME_TIMELINE:
+                coordinator.async_resume_timeline()
+            else:
+                coordinator.async_stop_timeline()
+
+    for service in (SERVICE_PAUSE_TIMELINE, SERVICE_RESUME_TIMELINE, SERVICE_STOP_TIMELINE):
+        hass.services.async_register(
+            DOMAIN, service, _async_control_timeline, schema=ENTITY_IDS_SCHEMA
+        )
+
+    async def _async_snapshot(call: ServiceCall) -> None:
+        coordinators = async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+        await async_get_snapshots(hass).async_take(call.data[ATTR_NAME], coordinators)
+
+    async def _async_restore(call: ServiceCall) -> None:
+        if ATTR_ENTITY_ID in call.data:
+            coordinators = async_get_coordinators(hass, call.data[ATTR_ENTITY_ID])
+        else:
+            coordinators = [
+                coordinator
+                for coordinator in hass.data.get(DOMAIN, {}).values()
+                if isinstance(coordinator, LightCoordinator)
+            ]
+        if not await async_get_snapshots(hass).async_restore(call.data[ATTR_NAME], coordinators):
+            raise ServiceValidationError(f"No Fluora snapshot named {call.data[ATTR_NAME]!r}")
+
+    async def _async_delete_snapshot(call: ServiceCall) -> None:
+        if not await async_get_snapshots(hass).async_delete(call.data[ATTR_NAME]):
+            raise ServiceValidationError(f"No Fluora snapshot named {call.data[ATTR_NAME]!r}")
+
+    hass.services.async_register(DOMAIN, SERVICE_SNAPSHOT, _async_snapshot, schema=SNAPSHOT_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RESTORE, _async_restore, schema=RESTORE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, SERVICE_DELETE_SNAPSHOT, _async_delete_snapshot, schema=DELETE_SNAPSHOT_SCHEMA
+    )
+
+    async def _async_profile(call: ServiceCall) -> ServiceResponse:
+        return await async_profile(
+            hass, call.data[ATTR_MODE], call.data[ATTR_DURATION], call.data[ATTR_INTERVAL]
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
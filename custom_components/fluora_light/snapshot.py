@@ -0,0 +1,145 @@
+"""Named light snapshots, precompiled into packet bursts and kept in .storage."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .coordinator import STATE_ORDER, LightCoordinator, LightState
+from .group import async_connect_all, async_send_lockstep
+
+DATA_SNAPSHOTS = "snapshots"
+
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+STORAGE_VERSION = 1
+SAVE_DELAY = 1.0
+
+
+@dataclass(slots=True)
+class DeviceSnapshot:
+    """State of one light and the burst that restores it."""
+
+    state: dict[LightState, Any]
+    device_mode: int | None
+    packets: tuple[bytes, ...]
+
+    @classmethod
+    def from_coordinator(cls, coordinator: LightCoordinator) -> DeviceSnapshot:
+        return cls(
+            state={key: coordinator.data[key] for key in STATE_ORDER},
+            device_mode=coordinator.device_mode,
+            packets=coordinator.snapshot_packets(),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DeviceSnapshot:
+        state = {LightState(key): value for key, value in data["state"].items()}
+        if (hs_color := state.get(LightState.HS_COLOR)) is not None:
+            state[LightState.HS_COLOR] = tuple(hs_color)
+        return cls(
+            state=state,
+            device_mode=data.get("device_mode"),
+            packets=tuple(bytes.fromhex(packet) for packet in data["packets"]),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "state": {str(key): value for key, value in self.state.items()},
+            "device_mode": self.device_mode,
+            "packets": [packet.hex() for packet in self.packets],
+        }
+
+
+class FluoraSnapshots:
+    """Snapshots by name, each holding one DeviceSnapshot per light hostname."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._snapshots: dict[str, dict[str, DeviceSnapshot]] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def _async_load(self) -> dict[str, dict[str, DeviceSnapshot]]:
+        if self._snapshots is None:
+            async with self._load_lock:
+                if self._snapshots is None:
+                    stored = await self._store.async_load() or {}
+                    self._snapshots = {
+                        name: {
+                            hostname: DeviceSnapshot.from_dict(device)
+                            for hostname, device in devices.items()
+                        }
+                        for name, devices in stored.get("snapshots", {}).items()
+                    }
+        return self._snapshots
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        assert self._snapshots is not None
+        return {
+            "snapshots": {
+                name: {hostname: device.as_dict() for hostname, device in devices.items()}
+                for name, devices in self._snapshots.items()
+            }
+        }
+
+    async def async_names(self) -> list[str]:
+        return sorted(await self._async_load())
+
+    async def async_take(self, name: str, coordinators: Sequence[LightCoordinator]) -> None:
+        """Capture the lights under name, replacing any snapshot of that name."""
+        snapshots = await self._async_load()
+        snapshots[name] = {
+            coordinator.hostname: DeviceSnapshot.from_coordinator(coordinator)
+            for coordinator in coordinators
+        }
+        self._async_schedule_save()
+
+    async def async_restore(self, name: str, coordinators: Sequence[LightCoordinator]) -> bool:
+        """Fire the stored bursts at the given lights that are part of the snapshot.
+
+        Step N of every light's burst goes out before step N + 1 of any light, and
+        packets a light already has are left out. Returns False for an unknown name.
+        """
+        if (devices := (await self._async_load()).get(name)) is None:
+            return False
+
+        targets = await async_connect_all(
+            [coordinator for coordinator in coordinators if coordinator.hostname in devices]
+        )
+        # Stop transitions first: finishing one changes what the device already has.
+        for coordinator in targets:
+            coordinator.async_interrupt(devices[coordinator.hostname].state)
+        await async_send_lockstep(
+            {
+                coordinator: coordinator.prepare_packets(devices[coordinator.hostname].packets)
+                for coordinator in targets
+            }
+        )
+        for coordinator in targets:
+            coordinator.async_apply_state(devices[coordinator.hostname].state)
+        return True
+
+    async def async_delete(self, name: str) -> bool:
+        if (await self._async_load()).pop(name, None) is None:
+            return False
+        self._async_schedule_save()
+        return True
+
+
+@callback
+def async_get_snapshots(hass: HomeAssistant) -> FluoraSnapshots:
+    """Return the integration-wide snapshot store, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (snapshots := domain_data.get(DATA_SNAPSHOTS)) is None:
+        snapshots = domain_data[DATA_SNAPSHOTS] = FluoraSnapshots(hass)
+    return snapshots
@@ -0,0 +1,91 @@
+"""Light state with per-field versions and dirty bits."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from enum import StrEnum
+from typing import Any
+
+from homeassistant.components.light import ATTR_BRIGHTNESS, ATTR_EFFECT, ATTR_HS_COLOR
+
+
+class LightState(StrEnum):
+    """Coordinator state keys; each is also the FluoraState slot holding its value."""
+
+    BRIGHTNESS = ATTR_BRIGHTNESS
+    POWER = "power"
+    EFFECT = ATTR_EFFECT
+    HS_COLOR = ATTR_HS_COLOR
+    SPEED = "speed"
+    SIZE = "size"
+
+
+STATE_FIELDS: tuple[LightState, ...] = tuple(LightState)
+_INDEX: dict[LightState, int] = {key: index for index, key in enumerate(STATE_FIELDS)}
+
+
+def state_mask(*keys: LightState) -> int:
+    """Bit mask selecting the given fields, as used for dirty bits and subscriptions."""
+    mask = 0
+    for key in keys:
+        mask |= 1 << _INDEX[key]
+    return mask
+
+
+class FluoraState:
+    """Current state of one light, one slot per LightState field.
+
+    Assigning a different value bumps the field's version and sets its dirty bit;
+    assigning an equal value does nothing. The coordinator takes the dirty bits when it
+    notifies listeners, so each listener only hears about the fields it subscribed to.
+    """
+
+    __slots__ = ("brightness", "power", "effect", "hs_color", "speed", "size", "versions", "dirty")
+
+    def __init__(self, **values: Any) -> None:
+        for key in STATE_FIELDS:
+            setattr(self, key, values.get(key))
+        self.versions = [0] * len(STATE_FIELDS)
+        self.dirty = 0
+
+    def __getitem__(self, key: LightState) -> Any:
+        return getattr(self, key)
+
+    def __setitem__(self, key: LightState, value: Any) -> None:
+        if getattr(self, key) == value:
+            return
+        setattr(self, key, value)
+        index = _INDEX[key]
+        self.versions[index] += 1
+        self.dirty |= 1 << index
+
+    def __iter__(self) -> Iterator[LightState]:
+        return iter(STATE_FIELDS)
+
+    def get(self, key: LightState, default: Any = None) -> Any:
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def items(self) -> Iterator[tuple[LightState, Any]]:
+        for key in STATE_FIELDS:
+            yield key, getattr(self, key)
+
+    def update(self, changes: Mapping[LightState, Any]) -> None:
+        for key, value in changes.items():
+            self[key] = value
+
+    def restore(self, changes: Mapping[LightState, Any]) -> None:
+        """Seed values without bumping versions or marking them dirty."""
+        for key, value in changes.items():
+            setattr(self, key, value)
+
+    def version(self, key: LightState) -> int:
+        return self.versions[_INDEX[key]]
+
+    def take_dirty(self) -> int:
+        """Return the fields changed since the last call and clear their dirty bits."""
+        dirty, self.dirty = self.dirty, 0
+        return dirty
+
+    def as_dict(self) -> dict[str, Any]:
+        return {str(key): value for key, value in self.items()}
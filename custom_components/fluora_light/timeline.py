@@ -0,0 +1,169 @@
+"""Keyframe timelines compiled into preencoded packet schedules."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from .const import (
+    BRIGHTNESS_ROUTE,
+    HUE_ROUTE,
+    MANUAL_SIZE_ROUTE,
+    MANUAL_SPEED_ROUTE,
+    SATURATION_ROUTE,
+    hs_to_device,
+)
+from .fade import Frame, interpolate_hs
+from .osc import osc_bundle
+from .routes import (
+    BRIGHTNESS_PACKETS,
+    ROUTE_HUE,
+    ROUTE_SATURATION,
+    ROUTE_SIZE,
+    ROUTE_SPEED,
+    ROUTES,
+)
+
+CHANNEL_HUE = "hue"
+CHANNEL_SATURATION = "saturation"
+CHANNEL_BRIGHTNESS = "brightness"
+CHANNEL_SPEED = "speed"
+CHANNEL_SIZE = "size"
+CHANNELS = (CHANNEL_HUE, CHANNEL_SATURATION, CHANNEL_BRIGHTNESS, CHANNEL_SPEED, CHANNEL_SIZE)
+
+EASING_LINEAR = "linear"
+EASINGS: dict[str, Callable[[float], float]] = {
+    EASING_LINEAR: lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1.0 - (1.0 - t) * (1.0 - t),
+    "ease_in_out": lambda t: t * t * (3.0 - 2.0 * t),
+    # Hold the previous value and jump at the keyframe.
+    "step": lambda t: 1.0 if t >= 1.0 else 0.0,
+}
+
+_HUE = ROUTES[ROUTE_HUE]
+_SATURATION = ROUTES[ROUTE_SATURATION]
+_SPEED = ROUTES[ROUTE_SPEED]
+_SIZE = ROUTES[ROUTE_SIZE]
+
+# Upper bound on precomputed frames (30 minutes at 20 fps).
+MAX_FRAMES = 36_000
+
+
+@dataclass(slots=True)
+class Keyframe:
+    """Channel values reached at a time offset, approached with the given easing."""
+
+    at: float
+    values: dict[str, float] = field(default_factory=dict)
+    easing: str = EASING_LINEAR
+
+
+class _Track:
+    """Keyframes of one channel, sampled at arbitrary times."""
+
+    def __init__(self, points: list[tuple[float, float, str]], wrap: float | None) -> None:
+        self._times = [point[0] for point in points]
+        self._points = points
+        # Hue wraps around the color wheel and takes the shortest way.
+        self._wrap = wrap
+
+    def sample(self, at: float) -> float:
+        index = bisect_right(self._times, at)
+        if index == 0:
+            return self._points[0][1]
+        if index == len(self._points):
+            return self._points[-1][1]
+        start_at, start, _ = self._points[index - 1]
+        end_at, end, easing = self._points[index]
+        t = EASINGS[easing]((at - start_at) / (end_at - start_at))
+        if self._wrap is not None:
+            return interpolate_hs((start, 0.0), (end, 0.0), t)[0]
+        return start + (end - start) * t
+
+
+def timeline_duration(keyframes: Sequence[Keyframe]) -> float:
+    return max((keyframe.at for keyframe in keyframes), default=0.0)
+
+
+def compile_timeline(
+    keyframes: Sequence[Keyframe],
+    *,
+    fps: float,
+    hs_color: tuple[float, float],
+    loop: bool = False,
+    use_bundles: bool = False,
+) -> list[Frame]:
+    """Compile keyframes into one frame of ready-to-send packets per 1 / fps seconds.
+
+    Each route is only sent when its packet differs from the previous frame, and
+    frame 0 carries every animated channel so a loop restarts from a known state.
+    hs_color supplies the hue or saturation when only the other one is animated.
+    """
+    tracks: dict[str, _Track] = {}
+    for channel in CHANNELS:
+        points = sorted(
+            (keyframe.at, float(keyframe.values[channel]), keyframe.easing)
+            for keyframe in keyframes
+            if channel in keyframe.values
+        )
+        if points:
+            tracks[channel] = _Track(points, 360.0 if channel == CHANNEL_HUE else None)
+
+    duration = timeline_duration(keyframes)
+    count = max(1, round(duration * fps))
+    # A loop's last keyframe coincides with frame 0 of the next pass.
+    total = count if loop else count + 1
+    if total > MAX_FRAMES:
+        raise ValueError(f"Timeline too long: {total} frames at {fps:g} fps")
+
+    hue_track = tracks.get(CHANNEL_HUE)
+    saturation_track = tracks.get(CHANNEL_SATURATION)
+    brightness_track = tracks.get(CHANNEL_BRIGHTNESS)
+    speed_track = tracks.get(CHANNEL_SPEED)
+    size_track = tracks.get(CHANNEL_SIZE)
+
+    frames: list[Frame] = []
+    previous: dict[str, bytes] = {}
+    for index in range(total):
+        at = duration * index / count
+        candidates: list[tuple[str, bytes]] = []
+
+        if hue_track is not None or saturation_track is not None:
+            hue, sat = hs_to_device(
+                hue_track.sample(at) if hue_track is not None else hs_color[0],
+                saturation_track.sample(at) if saturation_track is not None else hs_color[1],
+            )
+            candidates.append((SATURATION_ROUTE, _SATURATION.encode_device(sat)))
+            candidates.append((HUE_ROUTE, _HUE.encode_device(hue)))
+        if brightness_track is not None:
+            level = round(brightness_track.sample(at))
+            candidates.append((BRIGHTNESS_ROUTE, BRIGHTNESS_PACKETS[max(0, min(255, level))]))
+        if speed_track is not None:
+            candidates.append((MANUAL_SPEED_ROUTE, _SPEED.encode(speed_track.sample(at))))
+        if size_track is not None:
+            candidates.append((MANUAL_SIZE_ROUTE, _SIZE.encode(size_track.sample(at))))
+
+        packets = tuple(
+            packet for route, packet in candidates if index == 0 or previous.get(route) != packet
+        )
+        previous.update(candidates)
+        frames.append((osc_bundle(packets),) if use_bundles and len(packets) > 1 else packets)
+
+    return frames
+
+
+def uses_hs_color(keyframes: Sequence[Keyframe]) -> bool:
+    """Whether compile_timeline reads hs_color, i.e. only one of hue and saturation is animated."""
+    hue = any(CHANNEL_HUE in keyframe.values for keyframe in keyframes)
+    saturation = any(CHANNEL_SATURATION in keyframe.values for keyframe in keyframes)
+    return hue != saturation
+
+
+def final_values(keyframes: Sequence[Keyframe]) -> dict[str, float]:
+    """Last keyframed value of every animated channel."""
+    values: dict[str, float] = {}
+    for keyframe in sorted(keyframes, key=lambda keyframe: keyframe.at):
+        values.update(keyframe.values)
+    return values
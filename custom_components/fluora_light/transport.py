@@ -0,0 +1,163 @@
+"""Shared UDP transport for all Fluora Light config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import socket
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import DOMAIN, LOGGER
+
+DATA_TRANSPORT = "transport"
+
+Address = tuple[str, int]
+
+
+@dataclass(slots=True)
+class DestinationStats:
+    """Send counters for one destination address."""
+
+    packets: int = 0
+    bytes: int = 0
+    errors: int = 0
+    received: int = 0
+    last_error: str | None = None
+
+
+class _SharedProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol for the shared, unconnected socket."""
+
+    def __init__(self, manager: FluoraTransport) -> None:
+        self._manager = manager
+
+    def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+        self._manager._async_datagram_received(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        self._manager._async_error_received(exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._manager._async_connection_lost(exc)
+
+
+class FluoraTransport:
+    """One unconnected UDP endpoint shared by every coordinator.
+
+    Coordinators acquire a reference while set up and send with their resolved address.
+    The endpoint is closed when the last reference is released.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._transport: asyncio.DatagramTransport | None = None
+        self._lock = asyncio.Lock()
+        self._error_handlers: dict[Address, Callable[[Exception], None]] = {}
+        self._datagram_handlers: dict[Address, Callable[[bytes], None]] = {}
+        self._sending_to: Address | None = None
+        self.refcount = 0
+        self.stats: dict[Address, DestinationStats] = {}
+
+    @callback
+    def async_acquire(self) -> None:
+        self.refcount += 1
+
+    async def async_release(self) -> None:
+        async with self._lock:
+            self.refcount = max(0, self.refcount - 1)
+            if self.refcount == 0 and self._transport is not None:
+                self._transport.close()
+                self._transport = None
+
+    async def async_open(self) -> None:
+        """Open the shared endpoint if it is not open yet."""
+        if self._transport is not None and not self._transport.is_closing():
+            return
+        async with self._lock:
+            if self._transport is None or self._transport.is_closing():
+                transport, _ = await self._hass.loop.create_datagram_endpoint(
+                    lambda: _SharedProtocol(self),
+                    local_addr=("0.0.0.0", 0),
+                    family=socket.AF_INET,
+                )
+                self._transport = transport
+
+    @callback
+    def async_register(
+        self,
+        address: Address,
+        on_error: Callable[[Exception], None],
+        on_datagram: Callable[[bytes], None],
+    ) -> None:
+        """Route send errors and datagrams from an address to its coordinator."""
+        self._error_handlers[address] = on_error
+        self._datagram_handlers[address] = on_datagram
+
+    @callback
+    def async_unregister(self, address: Address) -> None:
+        self._error_handlers.pop(address, None)
+        self._datagram_handlers.pop(address, None)
+
+    def sendto(self, payload: bytes, address: Address) -> None:
+        transport = self._transport
+        if transport is None or transport.is_closing():
+            raise UpdateFailed("Transport not initialized")
+
+        stats = self.stats.get(address)
+        if stats is None:
+            stats = self.stats[address] = DestinationStats()
+        stats.packets += 1
+        stats.bytes += len(payload)
+
+        # Immediate send errors are reported synchronously through error_received,
+        # which lets them be attributed to this destination.
+        self._sending_to = address
+        try:
+            transport.sendto(payload, address)
+        finally:
+            self._sending_to = None
+
+    @callback
+    def _async_datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+        address = (addr[0], addr[1])
+        if (handler := self._datagram_handlers.get(address)) is None:
+            return
+        if (stats := self.stats.get(address)) is not None:
+            stats.received += 1
+        handler(data)
+
+    @callback
+    def _async_error_received(self, exc: Exception) -> None:
+        address = self._sending_to
+        if address is None:
+            LOGGER.debug("Unattributed UDP error on shared transport: %s", exc)
+            return
+
+        stats = self.stats[address]
+        stats.errors += 1
+        stats.last_error = str(exc)
+        if (handler := self._error_handlers.get(address)) is not None:
+            handler(exc)
+
+    @callback
+    def _async_connection_lost(self, exc: Exception | None) -> None:
+        if exc is None:
+            return
+        LOGGER.debug("Shared UDP transport lost: %s", exc)
+        self._transport = None
+        # Every coordinator reconnects (and reopens the endpoint) on its next send.
+        for handler in list(self._error_handlers.values()):
+            handler(exc)
+
+
+@callback
+def async_get_transport(hass: HomeAssistant) -> FluoraTransport:
+    """Return the integration-wide transport, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (manager := domain_data.get(DATA_TRANSPORT)) is None:
+        manager = domain_data[DATA_TRANSPORT] = FluoraTransport(hass)
+    return manager
@@ -0,0 +1,280 @@
+"""Microbenchmarks for the Fluora Light encoding and send hot paths.
+
+Runs standalone (no Home Assistant instance is started) against a loopback UDP
+receiver. Save a baseline before a refactor and compare against it afterwards:
+
+    python tools/bench.py --save tools/bench_baseline.json
+    python tools/bench.py --compare tools/bench_baseline.json
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+import gc
+import json
+from pathlib import Path
+import platform
+import socket
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.fluora_light.const import HUE_ROUTE, hs_to_device  # noqa: E402
+from custom_components.fluora_light.coordinator import (  # noqa: E402
+    LightCoordinator,
+    LightState,
+)
+from custom_components.fluora_light.osc import osc_decode_message, osc_message  # noqa: E402
+from custom_components.fluora_light.routes import (  # noqa: E402
+    ROUTE_BRIGHTNESS,
+    ROUTE_HUE,
+    ROUTES,
+)
+
+
+@dataclass(slots=True)
+class Result:
+    name: str
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    peak_bytes_per_call: float | None
+
+
+def _percentile(samples: list[int], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] / 1000.0
+
+
+def _peak_bytes_per_call(fn: Callable[[], object], calls: int = 200) -> float:
+    """Mean peak of memory allocated during a call, temporaries included.
+
+    The peak is measured from what was allocated before the call, so it covers
+    intermediate objects freed before the call returns as well as the result.
+    """
+    gc.collect()
+    tracemalloc.start()
+    total = 0
+    try:
+        for _ in range(calls):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            result = fn()
+            total += tracemalloc.get_traced_memory()[1] - before
+            del result
+    finally:
+        tracemalloc.stop()
+    return total / calls
+
+
+def bench(name: str, fn: Callable[[], object], number: int) -> Result:
+    """Time a synchronous callable call by call."""
+    for _ in range(min(number, 1000)):
+        fn()
+
+    clock = time.perf_counter_ns
+    samples: list[int] = []
+    gc.disable()
+    try:
+        start = clock()
+        for _ in range(number):
+            t0 = clock()
+            fn()
+            samples.append(clock() - t0)
+        total = clock() - start
+    finally:
+        gc.enable()
+
+    return Result(
+        name,
+        number / (total / 1e9),
+        _percentile(samples, 0.50),
+        _percentile(samples, 0.99),
+        _peak_bytes_per_call(fn),
+    )
+
+
+async def bench_async(name: str, fn: Callable[[], Awaitable[object]], number: int) -> Result:
+    """Time a coroutine function call by call on the running loop."""
+    for _ in range(min(number, 100)):
+        await fn()
+
+    clock = time.perf_counter_ns
+    samples: list[int] = []
+    start = clock()
+    for _ in range(number):
+        t0 = clock()
+        await fn()
+        samples.append(clock() - t0)
+    total = clock() - start
+
+    return Result(
+        name,
+        number / (total / 1e9),
+        _percentile(samples, 0.50),
+        _percentile(samples, 0.99),
+        None,
+    )
+
+
+async def run(number: int) -> list[Result]:
+    results: list[Result] = []
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.setblocking(False)
+    received = 0
+
+    def _on_readable() -> None:
+        nonlocal received
+        while True:
+            try:
+                receiver.recv(4096)
+            except BlockingIOError:
+                return
+            received += 1
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = LightCoordinator(
+            hass,
+            "bench",
+            {
+                "name": "bench",
+                "hostname": "127.0.0.1",
+                "port": receiver.getsockname()[1],
+                "packet_gap": 0,
+                "adaptive_pacing": False,
+            },
+        )
+        loop = asyncio.get_running_loop()
+        loop.add_reader(receiver.fileno(), _on_readable)
+
+        counter = iter(range(1 << 62))
+        hue = ROUTES[ROUTE_HUE]
+        brightness = ROUTES[ROUTE_BRIGHTNESS]
+        hue_packet = hue.encode_device(0.25)
+        results.append(
+            bench("osc_message", lambda: osc_message(HUE_ROUTE, ",fi", [0.25, 0]), number)
+        )
+        results.append(bench("codec_encode_hue", lambda: hue.encode_device(0.25), number))
+        results.append(
+            bench(
+                "codec_encode_brightness",
+                lambda: brightness.encode(next(counter) & 0xFF),
+                number,
+            )
+        )
+        results.append(
+            bench("osc_decode_message", lambda: osc_decode_message(hue_packet), number)
+        )
+        results.append(bench("codec_decode_hue", lambda: hue.decode(hue_packet), number))
+        results.append(
+            bench("hs_to_device", lambda: hs_to_device(next(counter) % 360, 75.0), number)
+        )
+
+        await coordinator.async_refresh()
+        await coordinator.send_queue.async_join()
+
+        async def _update_brightness() -> None:
+            # Vary the value so the coordinator never skips the packet as unchanged.
+            await coordinator.async_update_state(LightState.BRIGHTNESS, next(counter) & 0xFF)
+            await coordinator.send_queue.async_join()
+
+        sent_before = coordinator.send_queue.sent
+        results.append(
+            await bench_async("update_state_e2e", _update_brightness, max(1, number // 10))
+        )
+        sent = coordinator.send_queue.sent - sent_before
+
+        # Let the last datagrams arrive before checking nothing was lost on loopback.
+        await asyncio.sleep(0.1)
+        loop.remove_reader(receiver.fileno())
+        await coordinator.async_close()
+        await hass.async_stop(force=True)
+        receiver.close()
+
+    if received < sent:
+        print(f"warning: loopback receiver got {received} of {sent} packets", file=sys.stderr)
+    return results
+
+
+def _print(results: list[Result], baseline: dict[str, dict[str, float]] | None) -> None:
+    header = f"{'benchmark':<24}{'ops/sec':>14}{'p50 us':>10}{'p99 us':>10}{'peak B':>8}"
+    if baseline is not None:
+        header += f"{'vs base':>10}"
+    print(header)
+    for result in results:
+        line = (
+            f"{result.name:<24}{result.ops_per_sec:>14,.0f}{result.p50_us:>10.2f}"
+            f"{result.p99_us:>10.2f}"
+        )
+        line += (
+            "       -"
+            if result.peak_bytes_per_call is None
+            else f"{result.peak_bytes_per_call:>8.0f}"
+        )
+        if baseline is not None and result.name in baseline:
+            ratio = result.ops_per_sec / baseline[result.name]["ops_per_sec"]
+            line += f"{ratio:>9.2f}x"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Fluora Light hot paths.")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per benchmark")
+    parser.add_argument("--save", type=Path, help="Write results as a baseline JSON file")
+    parser.add_argument("--compare", type=Path, help="Compare against a baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Fail when ops/sec drops by more than this fraction (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.number))
+
+    baseline = None
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())["results"]
+    _print(results, baseline)
+
+    if args.save is not None:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "number": args.number,
+                    "results": {result.name: asdict(result) for result in results},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Saved baseline to {args.save}")
+
+    if baseline is None:
+        return 0
+
+    regressions = [
+        result.name
+        for result in results
+        if result.name in baseline
+        and result.ops_per_sec < baseline[result.name]["ops_per_sec"] * (1 - args.threshold)
+    ]
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
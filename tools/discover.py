@@ -0,0 +1,78 @@
+"""Scan a subnet for Fluora panels the way the config flow's discovery step does.
+
+Probes every address concurrently on the Fluora port and lists the ones that answer.
+Against simulated panels on loopback:
+
+    python tools/fluora_sim.py --count 20 --host 127.0.0.10 --per-address --echo
+    python tools/discover.py 127.0.0.0/24
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.fluora_light.const import DEFAULT_PORT  # noqa: E402
+from custom_components.fluora_light.discovery import (  # noqa: E402
+    SCAN_ATTEMPTS,
+    SCAN_CONCURRENCY,
+    SCAN_TIMEOUT,
+    async_scan,
+    subnet_hosts,
+)
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    try:
+        hosts = subnet_hosts(args.subnet)
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    found = await async_scan(
+        hosts,
+        args.port,
+        concurrency=args.concurrency,
+        timeout=args.timeout,
+        attempts=args.attempts,
+    )
+    elapsed = time.perf_counter() - started
+
+    for host in found:
+        print(host)
+    print(f"{len(found)} of {len(hosts)} address(es) answered in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scan a subnet for Fluora panels.")
+    parser.add_argument("subnet", help="IPv4 subnet to scan, e.g. 192.168.1.0/24")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="UDP port (default: 6767)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=SCAN_CONCURRENCY,
+        help=f"Hosts probed at once (default: {SCAN_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=SCAN_TIMEOUT,
+        help=f"Seconds each host gets to answer (default: {SCAN_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--attempts",
+        type=int,
+        default=SCAN_ATTEMPTS,
+        help=f"Probes sent per host within the timeout (default: {SCAN_ATTEMPTS})",
+    )
+    args = parser.parse_args()
+    return asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""Simulated Fluora devices on loopback UDP ports.
+
+Each device decodes the OSC packets it receives (plain messages and bundles) into
+power, mode, scene, brightness, hue, saturation, speed and size, records when
+every message arrived and can echo messages back like a real panel reports its
+state. Run standalone to point Home Assistant at fake panels:
+
+    python tools/fluora_sim.py --count 100 --base-port 16767 --echo
+
+With --per-address the devices share one port on consecutive loopback addresses
+instead, like panels on a LAN, which is what tools/discover.py scans for:
+
+    python tools/fluora_sim.py --count 20 --host 127.0.0.10 --per-address --echo
+"""
+
+import argparse
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+import ipaddress
+from pathlib import Path
+import socket
+import sys
+import time
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.fluora_light.routes import ROUTES  # noqa: E402
+from custom_components.fluora_light.osc import osc_decode, osc_split  # noqa: E402
+
+# Receive records kept per device; older ones are dropped.
+HISTORY = 100_000
+
+# Address -> codec, for applying received values to the simulated state.
+CODECS = {codec.spec.address: codec for codec in ROUTES.values()}
+
+# route, args, perf_counter_ns receive time
+Received = tuple[str, tuple[Any, ...], int]
+
+
+@dataclass(slots=True)
+class DeviceState:
+    """Last value received per route, in HA units; fields are named after route keys."""
+
+    power: bool = False
+    mode: int | None = None
+    scene: int | None = None
+    brightness: int | None = None
+    hue: float | None = None
+    saturation: float | None = None
+    speed: float | None = None
+    size: float | None = None
+
+
+class FakeFluora(asyncio.DatagramProtocol):
+    """One simulated panel bound to its own UDP port."""
+
+    def __init__(
+        self,
+        echo: bool = False,
+        on_message: Callable[["FakeFluora", str, tuple[Any, ...], int], None] | None = None,
+    ) -> None:
+        self.echo = echo
+        self.state = DeviceState()
+        self.received: deque[Received] = deque(maxlen=HISTORY)
+        self.datagrams = 0
+        self.messages = 0
+        self.errors = 0
+        self.port = 0
+        self._on_message = on_message
+        self._transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # type: ignore[assignment]
+        self.port = transport.get_extra_info("sockname")[1]
+
+    def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+        now = time.perf_counter_ns()
+        self.datagrams += 1
+        try:
+            messages = osc_decode(data)
+        except ValueError:
+            self.errors += 1
+            return
+
+        for route, args in messages:
+            self.messages += 1
+            self.received.append((route, args, now))
+            if args:
+                self._apply(route, args[0])
+            if self._on_message is not None:
+                self._on_message(self, route, args, now)
+
+        if self.echo and self._transport is not None:
+            # A real panel reports each changed value as a separate message.
+            for message in osc_split(data):
+                self._transport.sendto(message, addr)
+
+    def _apply(self, route: str, value: Any) -> None:
+        if (codec := CODECS.get(route)) is not None:
+            setattr(self.state, codec.spec.key, codec.from_device(value))
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+async def async_start_devices(
+    count: int,
+    *,
+    host: str = "127.0.0.1",
+    base_port: int = 0,
+    echo: bool = False,
+    per_address: bool = False,
+    on_message: Callable[[FakeFluora, str, tuple[Any, ...], int], None] | None = None,
+) -> list[FakeFluora]:
+    """Start count devices on consecutive ports from base_port (ephemeral ports if 0).
+
+    With per_address every device binds base_port on consecutive addresses from host.
+    """
+    loop = asyncio.get_running_loop()
+    devices: list[FakeFluora] = []
+    try:
+        for index in range(count):
+            if per_address:
+                local_addr = (str(ipaddress.IPv4Address(host) + index), base_port)
+            else:
+                local_addr = (host, base_port + index if base_port else 0)
+            _, device = await loop.create_datagram_endpoint(
+                lambda: FakeFluora(echo, on_message),
+                local_addr=local_addr,
+                family=socket.AF_INET,
+            )
+            devices.append(device)
+    except OSError:
+        for device in devices:
+            device.close()
+        raise
+    return devices
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    devices = await async_start_devices(
+        args.count,
+        host=args.host,
+        base_port=args.base_port,
+        echo=args.echo,
+        per_address=args.per_address,
+    )
+    if args.per_address:
+        last_host = ipaddress.IPv4Address(args.host) + len(devices) - 1
+        print(f"Simulating {len(devices)} Fluora device(s) on udp://", end="")
+        print(f"{args.host}-{last_host}:{args.base_port}")
+    else:
+        print(f"Simulating {len(devices)} Fluora device(s) on udp://{args.host}:", end="")
+        print(f"{devices[0].port}-{devices[-1].port}" if len(devices) > 1 else devices[0].port)
+
+    last = 0
+    try:
+        while True:
+            await asyncio.sleep(args.interval)
+            total = sum(device.messages for device in devices)
+            line = f"{(total - last) / args.interval:8.1f} msg/s  {total} total"
+            if len(devices) == 1:
+                line += f"  {devices[0].state}"
+            print(line)
+            last = total
+    finally:
+        for device in devices:
+            device.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run simulated Fluora devices.")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind host (default: 127.0.0.1)")
+    parser.add_argument("--base-port", type=int, default=6767, help="First port (default: 6767)")
+    parser.add_argument("--count", type=int, default=1, help="Number of devices (default: 1)")
+    parser.add_argument("--echo", action="store_true", help="Echo received messages back")
+    parser.add_argument(
+        "--per-address",
+        action="store_true",
+        help="Bind every device to --base-port on consecutive addresses from --host",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=5.0, help="Seconds between status lines (default: 5)"
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+"""Drive many LightCoordinators against simulated Fluora devices.
+
+Starts one simulated device per light on loopback, issues random brightness and
+color commands at a fixed rate per light and reports end-to-end command latency
+(service call to packet arrival), event loop lag and packet throughput:
+
+    python tools/load_test.py --lights 200 --rate 2 --duration 20 --echo
+"""
+
+import argparse
+import asyncio
+from collections import deque
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.fluora_light.const import BRIGHTNESS_ROUTE  # noqa: E402
+from custom_components.fluora_light.coordinator import LightCoordinator, LightState  # noqa: E402
+from custom_components.fluora_light.routes import BRIGHTNESS_LEVELS as LEVELS  # noqa: E402
+from fluora_sim import FakeFluora, async_start_devices  # noqa: E402
+
+# One HA brightness per distinct device level, so consecutive commands always differ.
+DISTINCT_BRIGHTNESS: tuple[int, ...] = tuple(
+    value for value in range(1, 256) if LEVELS[value] != LEVELS[value - 1]
+)
+
+
+def _percentiles(samples: list[float]) -> str:
+    if not samples:
+        return "n/a"
+    ordered = sorted(samples)
+
+    def pick(pct: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    return (
+        f"p50 {pick(0.50):7.2f}  p95 {pick(0.95):7.2f}  "
+        f"p99 {pick(0.99):7.2f}  max {ordered[-1]:7.2f} ms"
+    )
+
+
+class LatencyTracker:
+    """Match brightness commands to the packets the devices receive."""
+
+    def __init__(self) -> None:
+        self.pending: dict[int, deque[tuple[float, int]]] = {}
+        self.latencies_ms: list[float] = []
+        self.superseded = 0
+
+    def command(self, port: int, brightness: int) -> None:
+        self.pending.setdefault(port, deque()).append(
+            (LEVELS[brightness], time.perf_counter_ns())
+        )
+
+    def on_message(
+        self, device: FakeFluora, route: str, args: tuple[Any, ...], received: int
+    ) -> None:
+        if route != BRIGHTNESS_ROUTE or not (queue := self.pending.get(device.port)):
+            return
+        level = args[0]
+        if not any(pending_level == level for pending_level, _ in queue):
+            return
+        # Older commands still waiting were coalesced into this one.
+        while queue:
+            pending_level, issued = queue.popleft()
+            if pending_level == level:
+                self.latencies_ms.append((received - issued) / 1e6)
+                return
+            self.superseded += 1
+
+
+async def _async_monitor_lag(samples: list[float], interval: float, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def _async_drive(
+    coordinator: LightCoordinator,
+    port: int,
+    tracker: LatencyTracker,
+    rate: float,
+    stop: asyncio.Event,
+) -> int:
+    issued = 0
+    previous = -1
+    rng = random.Random(port)
+    # Spread the lights over the first period instead of firing all at once.
+    await asyncio.sleep(rng.random() / rate)
+    while not stop.is_set():
+        brightness = rng.choice(DISTINCT_BRIGHTNESS)
+        if brightness == previous:
+            continue
+        previous = brightness
+        tracker.command(port, brightness)
+        await coordinator.async_update_states(
+            {
+                LightState.BRIGHTNESS: brightness,
+                LightState.HS_COLOR: (rng.uniform(0, 360), rng.uniform(20, 100)),
+            }
+        )
+        issued += 1
+        await asyncio.sleep(1 / rate)
+    return issued
+
+
+async def run(args: argparse.Namespace) -> None:
+    tracker = LatencyTracker()
+    devices = await async_start_devices(args.lights, echo=args.echo, on_message=tracker.on_message)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinators = [
+            LightCoordinator(
+                hass,
+                f"sim{index}",
+                {
+                    "name": f"sim {index}",
+                    "hostname": "127.0.0.1",
+                    "port": device.port,
+                    "packet_gap": args.packet_gap,
+                    "use_bundles": args.bundles,
+                },
+            )
+            for index, device in enumerate(devices)
+        ]
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+        print(f"{len(coordinators)} lights connected; driving for {args.duration:.0f}s")
+
+        stop = asyncio.Event()
+        lag_ms: list[float] = []
+        monitor = asyncio.create_task(_async_monitor_lag(lag_ms, 0.05, stop))
+        messages_before = sum(device.messages for device in devices)
+        datagrams_before = sum(device.datagrams for device in devices)
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+
+        drivers = [
+            asyncio.create_task(
+                _async_drive(coordinator, device.port, tracker, args.rate, stop)
+            )
+            for coordinator, device in zip(coordinators, devices, strict=True)
+        ]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        issued = sum(await asyncio.gather(*drivers))
+        await asyncio.gather(*(coordinator.send_queue.async_join() for coordinator in coordinators))
+        await asyncio.sleep(0.2)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        await monitor
+
+        datagrams = sum(device.datagrams for device in devices) - datagrams_before
+        messages = sum(device.messages for device in devices) - messages_before
+        queues = [coordinator.send_queue for coordinator in coordinators]
+
+        print(f"commands issued   {issued} ({issued / elapsed:.1f}/s)")
+        print(f"delivered         {len(tracker.latencies_ms)}, superseded {tracker.superseded}")
+        print(f"command latency   {_percentiles(tracker.latencies_ms)}")
+        print(f"event loop lag    {_percentiles(lag_ms)}")
+        print(f"datagrams/sec     {datagrams / elapsed:.1f} ({messages / elapsed:.1f} messages/s)")
+        print(
+            "queues            "
+            f"sent {sum(queue.sent for queue in queues)}, "
+            f"coalesced {sum(queue.coalesced for queue in queues)}, "
+            f"preempted {sum(queue.preempted for queue in queues)}, "
+            f"dropped {sum(queue.dropped for queue in queues)}, "
+            f"skipped {sum(coordinator.skipped_packets for coordinator in coordinators)}"
+        )
+        print(f"cpu               {cpu / elapsed * 100:.1f}% of one core")
+
+        for coordinator in coordinators:
+            await coordinator.async_close()
+        await hass.async_stop(force=True)
+
+    for device in devices:
+        device.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test Fluora coordinators.")
+    parser.add_argument("--lights", type=int, default=100, help="Number of lights (default: 100)")
+    parser.add_argument(
+        "--rate", type=float, default=2.0, help="Commands per light per second (default: 2)"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds (default: 10)")
+    parser.add_argument(
+        "--packet-gap", type=int, default=50, help="Minimum gap between packets in ms (default: 50)"
+    )
+    parser.add_argument("--bundles", action="store_true", help="Send OSC bundles")
+    parser.add_argument("--echo", action="store_true", help="Devices echo state back")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,324 @@
+"""Capture UDP packets sent to a Fluora light, with OSC decoding and statistics.
+
+Datagrams are drained in batches from a non-blocking socket and can be written
+to a nanosecond-resolution pcap file (IPv4/UDP, readable by Wireshark/tcpdump)
+that rotates through a fixed number of size-capped files. On exit (Ctrl+C) a
+summary of per-source rates, inter-arrival jitter and per-route counts is printed.
+
+    python tools/udp_dump.py --port 6767 --decode
+    python tools/udp_dump.py --port 6767 --write capture.pcap --max-size 16 --ring 4
+    python tools/udp_dump.py --read capture.pcap
+"""
+
 import argparse
+from collections import Counter
+from dataclasses import dataclass, field
+import math
+from pathlib import Path
+import selectors
 import socket
+import struct
+import sys
+import time
+from typing import BinaryIO
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.fluora_light.osc import osc_decode, osc_route, osc_split  # noqa: E402
+from custom_components.fluora_light.routes import ROUTE_SPECS  # noqa: E402
+
+ROUTE_NAMES: dict[str, str] = {spec.address: spec.key for spec in ROUTE_SPECS}
+
+MAX_DATAGRAM = 65535
+# Upper bound on datagrams handled per wakeup, so output and stats keep up.
+RECV_BATCH = 256
+
+PCAP_MAGIC_NS = 0xA1B23C4D
+LINKTYPE_IPV4 = 228
+_PCAP_HEADER = struct.Struct("<IHHiIII")
+_PCAP_RECORD = struct.Struct("<IIII")
+_IPV4_HEADER = struct.Struct("!BBHHHBBH4s4s")
+_UDP_HEADER = struct.Struct("!HHHH")
+
+Address = tuple[str, int]
+
+
+def _ipv4_checksum(header: bytes) -> int:
+    total = sum(struct.unpack(f"!{len(header) // 2}H", header))
+    while total > 0xFFFF:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+class PcapRing:
+    """pcap writer that rotates through a fixed number of size-capped files.
+
+    The newest capture is always in path; older ones are path.1 ... path.N-1.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, files: int, local: Address) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._files = max(1, files)
+        self._local_ip = socket.inet_aton(local[0])
+        self._local_port = local[1]
+        self._file: BinaryIO | None = None
+        self._written = 0
+        self._open()
+
+    def _open(self) -> None:
+        self._file = open(self._path, "wb")
+        self._file.write(
+            _PCAP_HEADER.pack(PCAP_MAGIC_NS, 2, 4, 0, 0, MAX_DATAGRAM, LINKTYPE_IPV4)
+        )
+        self._written = _PCAP_HEADER.size
+
+    def _numbered(self, index: int) -> Path:
+        return self._path if index == 0 else self._path.with_name(f"{self._path.name}.{index}")
+
+    def _rotate(self) -> None:
+        assert self._file is not None
+        self._file.close()
+        for index in range(self._files - 1, 0, -1):
+            source = self._numbered(index - 1)
+            if source.exists():
+                source.replace(self._numbered(index))
+        self._open()
+
+    def write(self, timestamp_ns: int, source: Address, payload: bytes) -> None:
+        ip_header = _IPV4_HEADER.pack(
+            0x45,
+            0,
+            20 + 8 + len(payload),
+            0,
+            0,
+            64,
+            socket.IPPROTO_UDP,
+            0,
+            socket.inet_aton(source[0]),
+            self._local_ip,
+        )
+        ip_header = ip_header[:10] + _ipv4_checksum(ip_header).to_bytes(2, "big") + ip_header[12:]
+        udp_header = _UDP_HEADER.pack(source[1], self._local_port, 8 + len(payload), 0)
+        length = len(ip_header) + len(udp_header) + len(payload)
+
+        record_size = _PCAP_RECORD.size + length
+        if self._written + record_size > self._max_bytes and self._written > _PCAP_HEADER.size:
+            self._rotate()
+        assert self._file is not None
+        seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+        self._file.write(_PCAP_RECORD.pack(seconds, nanoseconds, length, length))
+        self._file.write(ip_header)
+        self._file.write(udp_header)
+        self._file.write(payload)
+        self._written += record_size
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_pcap(path: Path):
+    """Yield (timestamp_ns, source, payload) from a capture written by PcapRing."""
+    with open(path, "rb") as file:
+        magic, _, _, _, _, _, linktype = _PCAP_HEADER.unpack(file.read(_PCAP_HEADER.size))
+        if magic != PCAP_MAGIC_NS or linktype != LINKTYPE_IPV4:
+            raise ValueError(f"{path} is not a capture written by this tool")
+        while record := file.read(_PCAP_RECORD.size):
+            seconds, nanoseconds, length, _ = _PCAP_RECORD.unpack(record)
+            frame = file.read(length)
+            header_length = (frame[0] & 0x0F) * 4
+            source_port = _UDP_HEADER.unpack_from(frame, header_length)[0]
+            source = (socket.inet_ntoa(frame[12:16]), source_port)
+            yield seconds * 1_000_000_000 + nanoseconds, source, frame[header_length + 8 :]
+
+
+@dataclass(slots=True)
+class SourceStats:
+    packets: int = 0
+    bytes: int = 0
+    first_ns: int = 0
+    last_ns: int = 0
+    # Inter-arrival running sums for mean and standard deviation.
+    gap_sum: float = 0.0
+    gap_sq_sum: float = 0.0
+    # Inter-arrival histogram; bucket n holds gaps of [2**(n-1), 2**n) microseconds.
+    histogram: Counter[int] = field(default_factory=Counter)
+
+
+class Statistics:
+    def __init__(self) -> None:
+        self.sources: dict[Address, SourceStats] = {}
+        self.routes: Counter[str] = Counter()
+        self.malformed = 0
+
+    def add(self, timestamp_ns: int, source: Address, payload: bytes) -> None:
+        stats = self.sources.get(source)
+        if stats is None:
+            stats = self.sources[source] = SourceStats(first_ns=timestamp_ns)
+        elif stats.packets:
+            gap_us = (timestamp_ns - stats.last_ns) / 1000
+            stats.gap_sum += gap_us
+            stats.gap_sq_sum += gap_us * gap_us
+            stats.histogram[int(gap_us).bit_length()] += 1
+        stats.packets += 1
+        stats.bytes += len(payload)
+        stats.last_ns = timestamp_ns
+
+        try:
+            for message in osc_split(payload):
+                route = osc_route(message).decode("ascii", "replace")
+                self.routes[ROUTE_NAMES.get(route, route)] += 1
+        except ValueError:
+            self.malformed += 1
+
+    def report(self) -> str:
+        lines: list[str] = []
+        for (host, port), stats in sorted(self.sources.items()):
+            span = (stats.last_ns - stats.first_ns) / 1e9
+            rate = (stats.packets - 1) / span if span > 0 else 0.0
+            gaps = stats.packets - 1
+            lines.append(
+                f"{host}:{port}  {stats.packets} packets, {stats.bytes} bytes, {rate:.1f} pkt/s"
+            )
+            if gaps:
+                mean = stats.gap_sum / gaps
+                stdev = math.sqrt(max(0.0, stats.gap_sq_sum / gaps - mean * mean))
+                lines.append(
+                    f"  inter-arrival mean {mean / 1000:.2f} ms, "
+                    f"jitter (stdev) {stdev / 1000:.2f} ms"
+                )
+                peak = max(stats.histogram.values())
+                for bucket in sorted(stats.histogram):
+                    low = 0 if bucket == 0 else 1 << (bucket - 1)
+                    count = stats.histogram[bucket]
+                    bar = "#" * max(1, round(40 * count / peak))
+                    lines.append(
+                        f"  {_format_us(low):>9} - {_format_us(1 << bucket):<9} {count:>8}  {bar}"
+                    )
+        if self.routes:
+            lines.append("routes")
+            lines.extend(f"  {route:<16} {count}" for route, count in self.routes.most_common())
+        if self.malformed:
+            lines.append(f"malformed datagrams: {self.malformed}")
+        return "\n".join(lines) if lines else "no packets"
+
+
+def _format_us(value: int) -> str:
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:g}s"
+    if value >= 1000:
+        return f"{value / 1000:g}ms"
+    return f"{value}us"
+
+
+def _format_arg(arg: object) -> str:
+    return f"{arg:g}" if isinstance(arg, float) else str(arg)
+
+
+def format_packet(timestamp_ns: int, source: Address, payload: bytes, decode: bool) -> str:
+    prefix = f"{timestamp_ns / 1e9:.6f} {source[0]}:{source[1]}"
+    if not decode:
+        return f"{prefix}  {payload.hex()}"
+    try:
+        messages = osc_decode(payload)
+    except ValueError:
+        return f"{prefix}  malformed {payload.hex()}"
+    decoded = "; ".join(
+        " ".join([ROUTE_NAMES.get(route, route), *map(_format_arg, args)])
+        for route, args in messages
+    )
+    return f"{prefix}  {decoded}"
+
+
+def capture(args: argparse.Namespace, statistics: Statistics) -> None:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # A large kernel buffer absorbs bursts from fades and group scenes between wakeups.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, args.rcvbuf)
+    sock.bind((args.host, args.port))
+    sock.setblocking(False)
+    local = sock.getsockname()
+    print(f"Listening on udp://{local[0]}:{local[1]}", file=sys.stderr)
+
+    writer = (
+        PcapRing(args.write, args.max_size * 1024 * 1024, args.ring, local)
+        if args.write is not None
+        else None
+    )
+    buffer = bytearray(MAX_DATAGRAM)
+    view = memoryview(buffer)
+    selector = selectors.DefaultSelector()
+    selector.register(sock, selectors.EVENT_READ)
+    out = sys.stdout
+    next_report = time.monotonic() + args.stats_interval if args.stats_interval else None
+
+    try:
+        while True:
+            selector.select(timeout=1.0)
+            lines: list[str] = []
+            for _ in range(RECV_BATCH):
+                try:
+                    size, source = sock.recvfrom_into(buffer)
+                except BlockingIOError:
+                    break
+                timestamp_ns = time.time_ns()
+                payload = bytes(view[:size])
+                statistics.add(timestamp_ns, source, payload)
+                if writer is not None:
+                    writer.write(timestamp_ns, source, payload)
+                if not args.quiet:
+                    lines.append(format_packet(timestamp_ns, source, payload, args.decode))
+            if lines:
+                out.write("\n".join(lines) + "\n")
+                out.flush()
+            if next_report is not None and time.monotonic() >= next_report:
+                print(statistics.report(), file=sys.stderr)
+                next_report = time.monotonic() + args.stats_interval
+    finally:
+        selector.close()
+        sock.close()
+        if writer is not None:
+            writer.close()
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Dump UDP packets as hex.")
+    parser = argparse.ArgumentParser(
+        description="Capture and analyse UDP packets for Fluora lights."
+    )
     parser.add_argument("--host", default="0.0.0.0", help="Bind host (default: 0.0.0.0)")
     parser.add_argument("--port", type=int, default=6767, help="Bind port (default: 6767)")
+    parser.add_argument("--decode", action="store_true", help="Show decoded OSC instead of hex")
+    parser.add_argument("--quiet", action="store_true", help="Do not print packets")
+    parser.add_argument("--write", type=Path, help="Write a pcap capture to this file")
+    parser.add_argument(
+        "--max-size", type=int, default=16, help="Max MiB per capture file (default: 16)"
+    )
+    parser.add_argument("--ring", type=int, default=4, help="Capture files to keep (default: 4)")
+    parser.add_argument(
+        "--rcvbuf", type=int, default=4 * 1024 * 1024, help="Socket receive buffer in bytes"
+    )
+    parser.add_argument(
+        "--stats-interval", type=float, default=0, help="Print statistics every N seconds"
+    )
+    parser.add_argument("--read", type=Path, help="Analyse a capture file instead of listening")
     args = parser.parse_args()
 
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind((args.host, args.port))
-    print(f"Listening on udp://{args.host}:{args.port}")
+    statistics = Statistics()
+    if args.read is not None:
+        for timestamp_ns, source, payload in read_pcap(args.read):
+            statistics.add(timestamp_ns, source, payload)
+            if not args.quiet:
+                print(format_packet(timestamp_ns, source, payload, args.decode))
+        print(statistics.report())
+        return 0
 
-    while True:
-        data, addr = sock.recvfrom(4096)
-        print(f"{addr[0]}:{addr[1]}  {data.hex()}")
+    try:
+        capture(args, statistics)
+    except KeyboardInterrupt:
+        pass
+    print(statistics.report(), file=sys.stderr)
+    return 0
 
 
 if __name__ == "__main__":